@@ -0,0 +1,148 @@
+"""
+Gomoku Actor/Learner Training Module
+
+DQN self-play split across processes on one CPU host. Actor processes play
+GomokuEnv games with their own copy of the network, each at a fixed
+exploration rate, and send every finished episode to the learner through a
+queue. The learner adds them to its replay buffer and trains without
+waiting for games. Every `publish_every` updates it copies its weights into
+a shared-memory network, which actors reload between episodes.
+"""
+
+import os
+import queue
+import time
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from dqn_agent import DQN, DQNAgent
+from gomoku_env import GomokuEnv
+
+
+def actor_epsilon(actor, actors, base=0.4, spread=7):
+    """Exploration rate of actor number `actor`, from `base` down to base ** (1 + spread)."""
+    if actors == 1:
+        return base
+    return base ** (1 + spread * actor / (actors - 1))
+
+
+def run_actor(actor, actors, size, shared_model, version, lock, episodes, stop):
+    """Play episodes until `stop` is set, sending (states, actions, rewards) for each."""
+    # Actors share the host with each other and the learner
+    torch.set_num_threads(1)
+    env = GomokuEnv(size)
+    agent = DQNAgent(size, size * size, device="cpu", memory_size=1)
+    agent.epsilon = actor_epsilon(actor, actors)
+    seen = -1
+    while not stop.is_set():
+        if version.value != seen:
+            with lock:
+                agent.model.load_state_dict(shared_model.state_dict())
+                seen = version.value
+
+        state, info = env.reset()
+        states, actions, rewards = [], [], []
+        done = False
+        with torch.no_grad():
+            while not done:
+                action = agent.act(state, info["action_mask"])
+                next_state, reward, done, _, info = env.step(action)
+                states.append(state)
+                actions.append(action)
+                rewards.append(reward)
+                state = next_state
+        episodes.put((np.array(states, dtype=np.int8), np.array(actions), np.array(rewards, dtype=np.float32)))
+
+
+def train_actor_learner(actors=4, episodes=20000, batch_size=64, target_update=1000, publish_every=100,
+                        size=19, prioritized=False, writer=None, save_every=100, model_dir="models",
+                        max_seconds=None):
+    """Train a DQNAgent from `episodes` self-play games played by `actors` processes.
+
+    Training also stops after `max_seconds`, if given. Returns the trained
+    agent and throughput counters: episodes, env steps, learner updates
+    and seconds, plus episodes per hour and steps and updates per second.
+    Time is counted from the first episode received, so process start-up
+    is left out; if none is received, the counters are all zero.
+    """
+    torch.set_num_threads(max(1, (os.cpu_count() or 1) - actors))
+    agent = DQNAgent(size, size * size, device="cpu", prioritized=prioritized)
+    shared_model = DQN(size)
+    shared_model.load_state_dict(agent.model.state_dict())
+    shared_model.share_memory()
+
+    context = mp.get_context("spawn")
+    version = context.Value("i", 0)
+    lock = context.Lock()
+    stop = context.Event()
+    episode_queue = context.Queue(maxsize=16 * actors)
+    processes = [context.Process(target=run_actor, daemon=True,
+                                 args=(i, actors, size, shared_model, version, lock, episode_queue, stop))
+                 for i in range(actors)]
+    for process in processes:
+        process.start()
+
+    collected = env_steps = updates = 0
+    start = None
+    try:
+        while collected < episodes and (start is None or max_seconds is None
+                                        or time.perf_counter() - start < max_seconds):
+            # Take every finished game; only wait when there is nothing to train on
+            while collected < episodes:
+                waiting = len(agent.memory) <= batch_size
+                try:
+                    states, actions, rewards = episode_queue.get(block=waiting, timeout=1.0)
+                except queue.Empty:
+                    break
+                if start is None:
+                    start = time.perf_counter()
+                last = len(states) - 1
+                for t in range(len(states)):
+                    next_state = states[t + 1] if t < last else states[t]
+                    agent.remember(states[t], actions[t], rewards[t], next_state, t == last)
+                env_steps += len(states)
+                if writer is not None:
+                    writer.add_scalar('Reward/Episode', rewards.sum(), collected)
+                collected += 1
+                if save_every and model_dir and collected % save_every == 0:
+                    agent.save(os.path.join(model_dir, f'gomoku_dqn_{collected}.pth'))
+
+            if len(agent.memory) <= batch_size:
+                continue
+            agent.replay(batch_size)
+            updates += 1
+            if updates % target_update == 0:
+                agent.update_target_model()
+            if updates % publish_every == 0:
+                with lock:
+                    shared_model.load_state_dict(agent.model.state_dict())
+                    version.value += 1
+            if updates % 1000 == 0:
+                seconds = time.perf_counter() - start
+                print(f"Updates: {updates}, Episodes: {collected}/{episodes}, "
+                      f"{env_steps / seconds:.0f} steps/s, {updates / seconds:.0f} updates/s")
+    finally:
+        stop.set()
+        # Drain the queue so actors blocked on a full queue can exit
+        while any(process.is_alive() for process in processes):
+            try:
+                episode_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for process in processes:
+            process.join()
+
+    seconds = 0.0 if start is None else time.perf_counter() - start
+    rate = 1 / seconds if seconds else 0.0
+    return agent, {
+        "actors": actors,
+        "episodes": collected,
+        "env_steps": env_steps,
+        "updates": updates,
+        "seconds": seconds,
+        "episodes_per_hour": collected * rate * 3600,
+        "steps_per_second": env_steps * rate,
+        "updates_per_second": updates * rate,
+    }
@@ -6,143 +6,139 @@ Copyright © 2023 TJ Qiu. All rights reserved.
 
 import numpy as np
 from board import Board
+from budget import SearchBudget
+from evaluator import IncrementalEvaluator, get_evaluator
+from move_ordering import MoveOrderer
+from opening_book import BookReader, OpeningBook
+from parallel import ParallelRootSearch
+from search_stats import SearchStats, StatsLogger
+from threat_space import ThreatSpaceSearch
+from threats import THREAT_PRIORITY, find_threat_move
+from transposition import EXACT, LOWER, UPPER, SharedTranspositionTable, TranspositionTable
+import os
 import random
 import time
 
+# Finite bounds so null windows (alpha, alpha + 1) stay well defined
+INFINITY = 10 ** 9
+# Half-width of the aspiration window around the previous iteration's score
+ASPIRATION_WINDOW = 1000
+
+# Opening book file written by opening_book.build_book, used when present
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "opening_book.bin")
+
+# The threat classes get_best_move plays without searching: immediate
+# wins and blocks, then (after the threat-space search) fours
+WINNING_THREATS = THREAT_PRIORITY[:2]
+FORCING_THREATS = THREAT_PRIORITY[:4]
+
+# Search budget per move at each difficulty. Node counts decide the move,
+# so it does not depend on machine speed or load; the time limits are only
+# a safety net. On bench/corpus.json the slowest move, threat-space search
+# included, took 0.15 s on easy, 2.2 s on medium and 4.7 s on hard, within
+# the old 1/3/5 s time limits; each limit here is at least twice that.
+DIFFICULTY_BUDGETS = {
+    "easy": SearchBudget(nodes=2000, seconds=1.0),
+    "medium": SearchBudget(nodes=10000, seconds=5.0),
+    "hard": SearchBudget(nodes=16000, seconds=10.0),
+}
+
+# Share of the move's time budget the threat-space search may take before
+# minimax starts
+THREAT_SPACE_SHARE = 0.25
+
+
+class SearchProgress:
+    """The best move known so far in a GomokuAI.search, as yielded after each completed iteration.
+
+    `final` is set on the last one, yielded once the search has stopped for
+    any reason; its move is the one get_best_move would have returned.
+    """
+
+    def __init__(self, move, score, depth, pv, nodes, seconds, source, final=False):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.pv = pv  # Expected line of play starting with `move`
+        self.nodes = nodes
+        self.seconds = seconds
+        self.source = source  # As in SearchStats.source
+        self.final = final
+
+    def __repr__(self):
+        return (f"SearchProgress(move={self.move}, score={self.score}, depth={self.depth}, "
+                f"nodes={self.nodes}, final={self.final})")
+
+
 class GomokuAI:
-    def __init__(self, depth=3, difficulty="medium"):
+    def __init__(self, depth=3, difficulty="medium", tt_size_mb=16, workers=1, book_path=BOOK_PATH,
+                 tt_path=None, stats_path=None, budget=None):
         self.depth = depth
-        self.evaluation_cache = {}
-        self.opening_moves = [(7, 7), (7, 8), (8, 7), (8, 8), (6, 6), (6, 7), (7, 6)]
-        
-        # Different time limits and depths based on difficulty
+        self.nodes = 0  # Nodes visited by minimax, for throughput measurements
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.iteration_nodes = []  # Nodes searched by each completed iteration
+        self.iterations = []  # (depth, score, best move) of each completed iteration
+        self.iteration_times = []  # Seconds taken by each completed iteration
+        self.leaf_evaluations = 0
+        self.completed_depth = 0
+        self.best_score = None
+        self.timed_out = False
+        self.orderer = MoveOrderer(15)
+        # Bounded transposition table; hits, misses and overwrites are counted on it.
+        # With tt_path it lives in a memory-mapped file shared with other
+        # processes and kept between sessions.
+        self.tt_path = tt_path
+        if tt_path:
+            self.tt = SharedTranspositionTable(tt_path, tt_size_mb)
+        else:
+            self.tt = TranspositionTable(tt_size_mb)
+        # Book replies cover every rotation and mirror image of the lines entered
+        self.opening_book = OpeningBook(15)
+        # Searched book positions, memory-mapped so only probed pages are read
+        self.book_file = BookReader(book_path) if book_path and os.path.exists(book_path) else None
+
+        # Different search budgets and depths based on difficulty
         self.difficulty = difficulty.lower()
         if self.difficulty == "easy":
-            self.time_limit = 1.0
             self.depth = 2
             self.use_opening_book = False
+            self.threat_modes = ()
         elif self.difficulty == "medium":
-            self.time_limit = 3.0
             self.depth = 4
             self.use_opening_book = True
+            self.threat_modes = ("vcf",)
         else:  # hard
-            self.time_limit = 5.0
             self.depth = 6
             self.use_opening_book = True
+            self.threat_modes = ("vcf", "vct")
+
+        self.budget = budget or DIFFICULTY_BUDGETS.get(self.difficulty, DIFFICULTY_BUDGETS["hard"])
+        self.clock = self.budget.start()
+
+        # Continuous-threat solver run before minimax, with its own node
+        # budget per mode and THREAT_SPACE_SHARE of the time budget
+        self.threat_search = ThreatSpaceSearch(node_budget=1500 if self.difficulty == "hard" else 2000)
+        self.threat_line = None  # Winning line found by the last call, if any
+        self.threat_space_nodes = 0  # Nodes visited by the threat-space search
+
+        # Statistics of the last get_best_move call, optionally appended to
+        # a JSON-lines file
+        self.stats = SearchStats()
+        self.stats_logger = StatsLogger(stats_path) if stats_path else None
+        self._tt_counts = (0, 0)
+
+        # With more than one worker the root moves are split across processes
+        self.workers = workers
+        self.parallel = ParallelRootSearch(workers, self.difficulty, tt_size_mb, tt_path) if workers > 1 else None
 
     def evaluate_position(self, board):
-        # Check for cached evaluation
-        board_hash = hash(str(board.board))
-        if board_hash in self.evaluation_cache:
-            return self.evaluation_cache[board_hash]
-            
-        # Check for immediate win
-        if board.check_win():
-            score = 100000 * -board.current_player  # Opponent won
-            self.evaluation_cache[board_hash] = score
-            return score
-            
-        score = 0
-        size = board.size
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        
-        # Count pieces for each player using numpy
-        black_count = np.sum(board.board == 1)
-        white_count = np.sum(board.board == -1)
-        
-        # Material advantage (small factor)
-        score += (black_count - white_count) * 10
+        # Boards prepared for search keep their own running evaluation
+        if board.evaluator is not None:
+            return board.evaluator.score()
 
-        # Evaluate patterns for each player
-        for player in [1, -1]:  # 1 for black, -1 for white
-            player_factor = 1 if player == 1 else -1
-            
-            # Create pattern scores based on threat level
-            # Five in a row (win)
-            five_score = 100000 * player_factor
-            # Open four (one move to win)
-            open_four_score = 15000 * player_factor
-            # Blocked four (can be blocked)
-            blocked_four_score = 4000 * player_factor
-            # Open three (can create an open four)
-            open_three_score = 3000 * player_factor
-            # Blocked three
-            blocked_three_score = 1000 * player_factor
-            # Open two
-            open_two_score = 500 * player_factor
-            
-            # Scan the entire board for patterns
-            for i in range(size):
-                for j in range(size):
-                    if board.board[i][j] == player:
-                        # Check each direction from this position
-                        for dr, dc in directions:
-                            # Count consecutive stones and empty spaces
-                            consecutive = 1
-                            empty_before = False
-                            empty_after = False
-                            
-                            # Check backwards for empty space
-                            r, c = i - dr, j - dc
-                            if 0 <= r < size and 0 <= c < size and board.board[r][c] == 0:
-                                empty_before = True
-                            
-                            # Check forwards for consecutive stones and empty space
-                            r, c = i + dr, j + dc
-                            while 0 <= r < size and 0 <= c < size and board.board[r][c] == player:
-                                consecutive += 1
-                                r += dr
-                                c += dc
-                            
-                            # Check for empty space after consecutive stones
-                            if 0 <= r < size and 0 <= c < size and board.board[r][c] == 0:
-                                empty_after = True
-                            
-                            # Evaluate the pattern
-                            if consecutive >= 5:
-                                score += five_score
-                            elif consecutive == 4:
-                                if empty_before and empty_after:
-                                    score += open_four_score
-                                elif empty_before or empty_after:
-                                    score += blocked_four_score
-                            elif consecutive == 3:
-                                if empty_before and empty_after:
-                                    score += open_three_score
-                                elif empty_before or empty_after:
-                                    score += blocked_three_score
-                            elif consecutive == 2:
-                                if empty_before and empty_after:
-                                    score += open_two_score
-
-        # Center control bonus (weighted by distance from center)
-        center = size // 2
-        for i in range(size):
-            for j in range(size):
-                if board.board[i][j] != 0:
-                    # Distance from center (smaller is better)
-                    distance = abs(i - center) + abs(j - center)
-                    # Maximum distance could be 2*center
-                    distance_factor = 1 - (distance / (2 * center))
-                    # Apply center control bonus
-                    score += board.board[i][j] * 50 * distance_factor
-
-        # Proximity to opponent's stones
-        # Encourage play near opponent's pieces
-        for i in range(size):
-            for j in range(size):
-                if board.board[i][j] == 0:  # Empty spot
-                    # Check surrounding squares for opponent pieces
-                    for di in [-1, 0, 1]:
-                        for dj in [-1, 0, 1]:
-                            ni, nj = i + di, j + dj
-                            if 0 <= ni < size and 0 <= nj < size and board.board[ni][nj] == -board.current_player:
-                                # Empty spots next to opponent pieces are valuable
-                                score += board.current_player * 5
-
-        # Cache the evaluation for future use
-        self.evaluation_cache[board_hash] = score
-        return score
+        # Pattern, centre and proximity terms come from the vectorised evaluator
+        return get_evaluator(board.size).evaluate(board)
 
     def _is_relevant_move(self, board, move):
         """Check if a move is near existing stones and worth evaluating."""
@@ -167,55 +163,242 @@ class GomokuAI:
                     
         return False
 
-    def minimax(self, board, depth, alpha, beta, maximizing_player, start_time):
-        # Check if time limit exceeded
-        if time.time() - start_time > self.time_limit:
-            return self.evaluate_position(board)
+    def _candidate_moves(self, board):
+        """Return the moves worth searching, read from the board's candidate frontier."""
+        # Consider all moves in small boards
+        if board.size <= 10:
+            return board.get_valid_moves()
+
+        relevant_moves = board.get_candidate_moves()
+        if not relevant_moves:
+            # Nothing on the board yet, so fall back to the centre area
+            relevant_moves = [move for move in board.get_valid_moves() if self._is_relevant_move(board, move)]
+        return relevant_moves or board.get_valid_moves()
+
+    def minimax(self, board, depth, alpha, beta, ply=1):
+        """Principal variation search that plays and unplays moves on `board` in place.
+
+        Negamax form: scores are from the point of view of the side to move.
+        The first move gets the full (alpha, beta) window and the rest a null
+        window, re-searched only if they beat alpha.
+        """
+        self.nodes += 1
+
+        # Once the budget is spent the whole iteration is abandoned. The
+        # clock only needs asking when the node count reaches its next check.
+        if self.timed_out or (self.nodes >= self.clock.next_check and self.clock.exhausted(self.nodes)):
+            self.timed_out = True
+            return 0
             
         # Terminal conditions
         if depth == 0 or board.check_win():
-            return self.evaluate_position(board)
+            self.leaf_evaluations += 1
+            return self.evaluate_position(board) * board.current_player
 
-        valid_moves = board.get_valid_moves()
-        if not valid_moves:
+        if board.is_full():
             return 0
 
-        # Filter to relevant moves to improve efficiency
-        relevant_moves = [move for move in valid_moves if self._is_relevant_move(board, move)]
-        if not relevant_moves:
-            relevant_moves = valid_moves
-            
-        # Limit the number of moves to evaluate at each level
-        if len(relevant_moves) > 12:
-            # Sort moves by distance to the center
-            center = board.size // 2
-            relevant_moves.sort(key=lambda m: abs(m[0] - center) + abs(m[1] - center))
-            relevant_moves = relevant_moves[:12]  # Take only the 12 closest to center
-
-        if maximizing_player:
-            max_eval = float('-inf')
-            for move in relevant_moves:
-                new_board = board.copy()
-                new_board.make_move(*move)
-                eval = self.minimax(new_board, depth - 1, alpha, beta, False, start_time)
-                max_eval = max(max_eval, eval)
-                alpha = max(alpha, eval)
+        # Look the position up in the transposition table. Keys are
+        # canonical, so rotations and mirror images share entries; stored
+        # moves are in the canonical frame.
+        key = board.canonical_key
+        transform = board.canonical_transform
+        entry = self.tt.probe(key)
+        tt_move = None
+        if entry is not None:
+            tt_depth, flag, score, move_index = entry
+            if tt_depth >= depth:
+                if flag == EXACT:
+                    return score
+                if flag == LOWER:
+                    alpha = max(alpha, score)
+                elif flag == UPPER:
+                    beta = min(beta, score)
                 if beta <= alpha:
+                    return score
+            if move_index >= 0:
+                tt_move = board.from_canonical(divmod(move_index, board.size), transform)
+
+        # Rank the moves near existing stones; the width kept depends on ply
+        relevant_moves = self.orderer.order(board, self._candidate_moves(board), ply, tt_move)
+
+        alpha_orig = alpha
+        best_eval = -INFINITY
+        best_move = None
+        for i, move in enumerate(relevant_moves):
+            board.make_move(*move)
+            if i == 0:
+                eval = -self.minimax(board, depth - 1, -beta, -alpha, ply + 1)
+            else:
+                eval = -self.minimax(board, depth - 1, -alpha - 1, -alpha, ply + 1)
+                if alpha < eval < beta:
+                    eval = -self.minimax(board, depth - 1, -beta, -eval, ply + 1)
+            board.undo_move()
+            if eval > best_eval:
+                best_eval, best_move = eval, move
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                self._record_cutoff(move, i, ply, depth)
+                break
+
+        # Results cut short by the time limit are not trustworthy enough to keep
+        if not self.timed_out:
+            if best_eval <= alpha_orig:
+                flag = UPPER
+            elif best_eval >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.tt.store(key, depth, flag, best_eval, self._tt_move(board, best_move, transform))
+        return best_eval
+
+    def _tt_move(self, board, move, transform=None):
+        """Flat index of `move` in the canonical frame, as stored in the transposition table."""
+        row, col = board.to_canonical(move, transform)
+        return row * board.size + col
+
+    def _search_root(self, board, moves, depth, alpha, beta):
+        """Search the root moves with PVS; return (score, best move, moves best first)."""
+        best_eval = -INFINITY
+        best_move = moves[0]
+        for i, move in enumerate(moves):
+            board.make_move(*move)
+            if i == 0:
+                eval = -self.minimax(board, depth - 1, -beta, -alpha)
+            else:
+                eval = -self.minimax(board, depth - 1, -alpha - 1, -alpha)
+                if alpha < eval < beta:
+                    eval = -self.minimax(board, depth - 1, -beta, -eval)
+            board.undo_move()
+            if self.timed_out:
+                break
+            if eval > best_eval:
+                best_eval, best_move = eval, move
+            alpha = max(alpha, eval)
+            if alpha >= beta:
+                break
+
+        ordered = [best_move] + [move for move in moves if move != best_move]
+        return best_eval, best_move, ordered
+
+    def iterative_deepening(self, board, moves):
+        """Deepen one ply at a time and return the best move of the last completed iteration."""
+        best_move = moves[0]
+        for best_move in self._deepen(board, moves):
+            pass
+        return best_move
+
+    def _deepen(self, board, moves):
+        """Iterative deepening that yields the best move after each completed iteration.
+
+        Each iteration searches the previous best move first and, from depth
+        3 on, starts with an aspiration window around the previous score,
+        widening it only on the side that failed.
+        """
+        score = None
+        for depth in range(1, self.depth + 1):
+            if not self.clock.allows_iteration(self.nodes):
+                break
+
+            if score is None or depth < 3:
+                alpha, beta = -INFINITY, INFINITY
+            else:
+                alpha, beta = score - ASPIRATION_WINDOW, score + ASPIRATION_WINDOW
+
+            iteration_start = self.nodes
+            iteration_time = time.time()
+            while True:
+                iteration_score, move, ordered = self._search_root(board, moves, depth, alpha, beta)
+                if self.timed_out:
                     break
-            return max_eval
-        else:
-            min_eval = float('inf')
-            for move in relevant_moves:
-                new_board = board.copy()
-                new_board.make_move(*move)
-                eval = self.minimax(new_board, depth - 1, alpha, beta, True, start_time)
-                min_eval = min(min_eval, eval)
-                beta = min(beta, eval)
-                if beta <= alpha:
+                if iteration_score <= alpha:
+                    alpha = -INFINITY
+                elif iteration_score >= beta:
+                    beta = INFINITY
+                else:
                     break
-            return min_eval
+            if self.timed_out:
+                break
+
+            best_move, score, moves = move, iteration_score, ordered
+            self.tt.store(board.canonical_key, depth, EXACT, score, self._tt_move(board, best_move))
+            self.completed_depth = depth
+            self.best_score = score
+            self.iteration_nodes.append(self.nodes - iteration_start)
+            self.iteration_times.append(time.time() - iteration_time)
+            self.iterations.append((depth, score, best_move))
+            yield best_move
+
+    def parallel_search(self, board, moves):
+        """Split the root moves across the worker pool and return the best move found.
+
+        Every worker gets the full budget for its share of the moves, with
+        the time budget counted from the start of this search.
+        """
+        move, score, depth = self.parallel.search(board, moves, self.depth, self.budget, self.clock.start_time,
+                                                  self.clock.cancel)
+        counters = self.parallel.counters
+        self.nodes = counters["nodes"]
+        self.leaf_evaluations = counters["leaf_evaluations"]
+        self.cutoffs = counters["cutoffs"]
+        self.first_move_cutoffs = counters["first_move_cutoffs"]
+        self.stats.tt_hits = counters["tt_hits"]
+        self.stats.tt_misses = counters["tt_misses"]
+        self.completed_depth = depth
+        self.best_score = score
+        return move
+
+    def close(self):
+        """Shut down the worker processes, if any, and close the stats and table files."""
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.stats_logger is not None:
+            self.stats_logger.close()
+        # Only the file-backed SharedTranspositionTable has anything to close
+        if hasattr(self.tt, "close"):
+            self.tt.close()
+
+    def principal_variation(self, board, length=None):
+        """Follow best moves through the transposition table from `board`."""
+        length = self.completed_depth if length is None else length
+        pv = []
+        for _ in range(length):
+            entry = self.tt.probe(board.canonical_key)
+            if entry is None or entry[3] < 0:
+                break
+            move = board.from_canonical(divmod(entry[3], board.size))
+            if not board.make_move(*move):
+                break
+            pv.append(move)
+            if board.check_win():
+                break
+        for _ in pv:
+            board.undo_move()
+        return pv
+
+    def _record_cutoff(self, move, index, ply, depth):
+        self.cutoffs += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        self.orderer.record_cutoff(move, ply, depth)
+
+    def search_report(self):
+        """Move-ordering quality for the last get_best_move call.
 
-    def _check_for_threats(self, board, player_color):
+        The effective branching factor is the growth in nodes between the
+        last two completed iterations; the first-move cutoff rate is the
+        share of beta cutoffs produced by the first move searched.
+        """
+        nodes = self.iteration_nodes
+        return {
+            "nodes": self.nodes,
+            "iteration_nodes": list(nodes),
+            "effective_branching_factor": nodes[-1] / nodes[-2] if len(nodes) >= 2 and nodes[-2] else None,
+            "beta_cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": self.first_move_cutoffs / self.cutoffs if self.cutoffs else None,
+        }
+
+    def _check_for_threats(self, board, player_color, threat_types=THREAT_PRIORITY):
         """Check for significant threats on the board and return the best move to make or block.
         
         Handles threats in order of priority:
@@ -225,326 +408,183 @@ class GomokuAI:
         4. Block opponent's open four
         3. Create/extend an open three that can lead to an open four
         4. Block opponent's open three
+
+        Only the classes named in `threat_types` are returned. All empty
+        cells are scanned at once by the threats module.
         """
-        size = board.size
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        opponent_color = -player_color
-        
-        # Dictionary to track moves by threat level
-        threat_moves = {
-            "win": [],             # Our immediate winning moves
-            "block_win": [],       # Moves to block opponent's win
-            "create_open4": [],    # Create our open four
-            "block_open4": [],     # Block opponent's open four
-            "create_open3": [],    # Create our open three
-            "block_open3": [],     # Block opponent's open three
-            "extend_seq": []       # Extend an existing sequence
-        }
-        
-        # Check each empty cell for potential threats
-        for i in range(size):
-            for j in range(size):
-                if board.board[i][j] != 0:  # Skip non-empty cells
-                    continue
-                    
-                # Try this move for us
-                temp_board = board.copy()
-                temp_board.board[i][j] = player_color
-                
-                # Check if this gives us a win
-                if self._has_five_in_a_row(temp_board, i, j, player_color):
-                    threat_moves["win"].append((i, j))
-                    continue
-                
-                # Try this move for opponent
-                temp_board = board.copy()
-                temp_board.board[i][j] = opponent_color
-                
-                # Check if opponent would win here
-                if self._has_five_in_a_row(temp_board, i, j, opponent_color):
-                    threat_moves["block_win"].append((i, j))
-                    continue
-                
-                # Check for creating open fours for us
-                temp_board = board.copy()
-                temp_board.board[i][j] = player_color
-                if self._has_open_four(temp_board, i, j, player_color):
-                    threat_moves["create_open4"].append((i, j))
-                    continue
-                
-                # Check for blocking opponent's open fours
-                temp_board = board.copy()
-                temp_board.board[i][j] = opponent_color
-                if self._has_open_four(temp_board, i, j, opponent_color):
-                    threat_moves["block_open4"].append((i, j))
-                    continue
-                
-                # Check for creating open threes for us
-                temp_board = board.copy()
-                temp_board.board[i][j] = player_color
-                if self._has_open_three(temp_board, i, j, player_color):
-                    threat_moves["create_open3"].append((i, j))
-                    continue
-                
-                # Check for blocking opponent's open threes
-                temp_board = board.copy()
-                temp_board.board[i][j] = opponent_color
-                if self._has_open_three(temp_board, i, j, opponent_color):
-                    threat_moves["block_open3"].append((i, j))
-                    continue
-                
-                # Check if this move extends an existing sequence
-                temp_board = board.copy()
-                temp_board.board[i][j] = player_color
-                if self._extends_sequence(temp_board, i, j, player_color):
-                    threat_moves["extend_seq"].append((i, j))
-        
-        # Return the best move based on priority
-        for threat_type in ["win", "block_win", "create_open4", "block_open4", "create_open3", "block_open3", "extend_seq"]:
-            if threat_moves[threat_type]:
-                # If we have multiple moves of the same threat level, pick the one closest to the center
-                if len(threat_moves[threat_type]) > 1:
-                    center = size // 2
-                    threat_moves[threat_type].sort(key=lambda m: abs(m[0] - center) + abs(m[1] - center))
-                return threat_moves[threat_type][0]
-        
-        return None
+        return find_threat_move(board, player_color, threat_types)
 
-    def _has_five_in_a_row(self, board, row, col, color):
-        """Check if placing a stone at (row, col) creates 5 in a row."""
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        size = board.size
-        
-        for dr, dc in directions:
-            count = 1  # The stone we just placed
-            
-            # Check in positive direction
-            r, c = row + dr, col + dc
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
-                count += 1
-                r += dr
-                c += dc
-            
-            # Check in negative direction
-            r, c = row - dr, col - dc
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
-                count += 1
-                r -= dr
-                c -= dc
-            
-            if count >= 5:
-                return True
-        
-        return False
+    def new_search(self, board, start_time=None, cancel=None):
+        """Reset per-move state and return the board the search should run on.
 
-    def _has_open_four(self, board, row, col, color):
-        """Check if placing a stone at (row, col) creates an open four (one move away from winning)."""
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        size = board.size
-        
-        for dr, dc in directions:
-            # Count consecutive stones
-            count = 1  # The stone we just placed
-            empty_ends = 0
-            
-            # Check if the sequence has open ends (spaces to extend)
-            
-            # Check in positive direction
-            r, c = row + dr, col + dc
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
-                count += 1
-                r += dr
-                c += dc
-            
-            # Is there an empty space after the sequence?
-            if 0 <= r < size and 0 <= c < size and board.board[r][c] == 0:
-                empty_ends += 1
-            
-            # Check in negative direction
-            r, c = row - dr, col - dc
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
-                count += 1
-                r -= dr
-                c -= dc
-            
-            # Is there an empty space before the sequence?
-            if 0 <= r < size and 0 <= c < size and board.board[r][c] == 0:
-                empty_ends += 1
-            
-            # An open four has exactly 4 stones and at least one open end
-            if count == 4 and empty_ends >= 1:
-                return True
-        
-        return False
+        The search works on a private copy; every move is made and undone in
+        place and the attached evaluator rescores only the lines through
+        each stone. The budget is counted from `start_time` (default now),
+        and the search stops early once the CancelToken `cancel` is set.
+        """
+        board = board.copy()
+        IncrementalEvaluator(board)
+        self.timed_out = False
+        self.clock = self.budget.start(start_time, cancel)
+        self.nodes = self.cutoffs = self.first_move_cutoffs = 0
+        self.iteration_nodes = []
+        self.iterations = []
+        self.iteration_times = []
+        self.leaf_evaluations = 0
+        self.completed_depth = 0
+        self.best_score = None
+        self.threat_line = None
+        self.threat_space_nodes = 0
+        self.stats = SearchStats()
+        self._tt_counts = (self.tt.hits, self.tt.misses)
+        if self.orderer.size != board.size:
+            self.orderer = MoveOrderer(board.size)
+        self.orderer.new_search()
+        return board
 
-    def _has_open_three(self, board, row, col, color):
-        """Check if placing a stone at (row, col) creates an open three (can lead to an open four)."""
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        size = board.size
-        
-        for dr, dc in directions:
-            # Count consecutive stones
-            count = 1  # The stone we just placed
-            empty_ends = 0
-            
-            # Check in positive direction
-            r, c = row + dr, col + dc
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
-                count += 1
-                r += dr
-                c += dc
-            
-            # Is there enough empty space after the sequence to make it valuable?
-            empty_after = 0
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == 0:
-                empty_after += 1
-                r += dr
-                c += dc
-                if empty_after >= 2:  # We need at least 2 empty spaces for an open three to be valuable
-                    break
-            
-            if empty_after >= 1:
-                empty_ends += 1
-            
-            # Check in negative direction
-            r, c = row - dr, col - dc
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
-                count += 1
-                r -= dr
-                c -= dc
-            
-            # Is there enough empty space before the sequence?
-            empty_before = 0
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == 0:
-                empty_before += 1
-                r -= dr
-                c -= dc
-                if empty_before >= 2:
-                    break
-            
-            if empty_before >= 1:
-                empty_ends += 1
-            
-            # An open three has exactly 3 stones and 2 open ends
-            if count == 3 and empty_ends == 2 and (empty_before >= 1 and empty_after >= 1):
-                return True
-        
-        return False
+    def _threat_space_win(self, board):
+        """Return a proven winning line for the side to move, or None.
 
-    def _extends_sequence(self, board, row, col, color):
-        """Check if placing a stone at (row, col) extends an existing sequence."""
-        directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
-        size = board.size
-        
-        for dr, dc in directions:
-            # Count consecutive stones
-            count = 1  # The stone we just placed
-            
-            # Check in positive direction
-            r, c = row + dr, col + dc
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
-                count += 1
-                r += dr
-                c += dc
-            
-            # Check in negative direction
-            r, c = row - dr, col - dc
-            while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
-                count += 1
-                r -= dr
-                c -= dc
-            
-            # If we found a sequence of 2 or more, this move extends it
-            if count >= 2:
-                return True
-        
-        return False
+        Each mode stops at its node budget; all of them together stop at
+        THREAT_SPACE_SHARE of the move's time budget, leaving the rest to minimax.
+        """
+        deadline = None
+        if self.clock.deadline is not None:
+            deadline = self.clock.start_time + self.budget.seconds * THREAT_SPACE_SHARE
+        for mode in self.threat_modes:
+            if self.clock.cancelled:
+                break
+            line = self.threat_search.solve(board, mode, self.clock.cancel, deadline)
+            self.threat_space_nodes += self.threat_search.nodes
+            if line:
+                self.threat_line = line
+                return line
+        return None
 
     def get_best_move(self, board):
-        valid_moves = board.get_valid_moves()
-        if not valid_moves:
+        for progress in self.search(board):
+            pass
+        return progress.move
+
+    def search(self, board, cancel=None):
+        """Anytime search: a generator of SearchProgress for the move to play on `board`.
+
+        One progress report is yielded after every completed deepening
+        iteration, then a final one once the search stops at its budget,
+        its depth or on `cancel`. Setting the CancelToken `cancel` (from any
+        thread) stops the search within a few hundred nodes, and the final
+        report carries the best move of the last completed iteration.
+        Moves found without searching (book, threats) only get the final
+        report. The board itself is not modified.
+        """
+        start_time = time.time()
+        board = self.new_search(board, start_time, cancel)
+        move = yield from self._choose_move(board)
+        self._finish_stats(board, move, start_time)
+        yield self._progress(board, move, final=True)
+
+    def _progress(self, board, move, final=False):
+        """Describe the best move known now as a SearchProgress."""
+        if self.stats.source == "threat_space":
+            pv = list(self.threat_line)
+        elif self.stats.source == "search":
+            pv = self.principal_variation(board)
+            if pv[:1] != [move]:
+                pv = [move]
+        else:
+            pv = [move] if move is not None else []
+        return SearchProgress(move, self.best_score, self.completed_depth, pv, self.nodes,
+                              self.clock.elapsed(), self.stats.source, final)
+
+    def _choose_move(self, board):
+        """Generator returning the move to play; it yields progress at each search iteration."""
+        stats = self.stats
+        if board.is_full():
             return None
 
+        # Positions searched offline come straight from the book file
+        if self.use_opening_book and self.book_file is not None:
+            with stats.phase("book"):
+                entry = self.book_file.probe(board)
+            if entry is not None:
+                stats.source = "book"
+                self.best_score = entry[1]
+                return entry[0]
+
         # Opening book moves (only on larger boards and if enabled)
         empty_count = np.sum(board.board == 0)
         if self.use_opening_book and board.size >= 15 and empty_count > board.size * board.size - 4:
-            opening_moves = [move for move in self.opening_moves if move in valid_moves]
+            if self.opening_book.size != board.size:
+                self.opening_book = OpeningBook(board.size)
+            opening_moves = self.opening_book.lookup(board)
             if opening_moves:
+                stats.source = "opening"
                 return random.choice(opening_moves)
 
         # For easy difficulty, sometimes make a random move
         if self.difficulty == "easy" and random.random() < 0.3:
-            return random.choice(valid_moves)
-            
-        # Check for threats and respond to them
-        threat_move = self._check_for_threats(board, board.current_player)
+            stats.source = "random"
+            return random.choice(board.get_valid_moves())
+
+        # Win or block a five straight away
+        with stats.phase("threats"):
+            threat_move = self._check_for_threats(board, board.current_player, WINNING_THREATS)
         if threat_move:
+            stats.source = "threat"
             return threat_move
 
-        # Filter to relevant moves to improve efficiency
-        relevant_moves = [move for move in valid_moves if self._is_relevant_move(board, move)]
-        if not relevant_moves:
-            relevant_moves = valid_moves
-
-        # For very few moves left, just quickly evaluate each one
-        if len(relevant_moves) <= 3:
-            best_move = None
-            best_score = float('-inf')
-            for move in relevant_moves:
-                new_board = board.copy()
-                new_board.make_move(*move)
-                score = self.evaluate_position(new_board)
-                if score > best_score:
-                    best_score = score
-                    best_move = move
-            return best_move
+        # A proven win by continuous fours (or threes) beats anything minimax finds
+        with stats.phase("threat_space"):
+            line = self._threat_space_win(board)
+        if line:
+            stats.source = "threat_space"
+            return line[0]
 
-        # Initialize search
-        best_move = None
-        best_eval = float('-inf')
-        alpha = float('-inf')
-        beta = float('inf')
-        start_time = time.time()
+        # Make or block fours straight away; quieter threats are left to the search
+        with stats.phase("threats"):
+            threat_move = self._check_for_threats(board, board.current_player, FORCING_THREATS)
+        if threat_move:
+            stats.source = "threat"
+            return threat_move
 
-        # Sort moves by distance to the center
-        center = board.size // 2
-        relevant_moves.sort(key=lambda m: abs(m[0] - center) + abs(m[1] - center))
-        
-        # Limit the number of moves to evaluate based on difficulty
-        max_moves = 8 if self.difficulty == "easy" else (12 if self.difficulty == "medium" else 16)
-        if len(relevant_moves) > max_moves:
-            relevant_moves = relevant_moves[:max_moves]
-    
-        # Regular minimax search with iterative deepening
-        current_depth = 1
-        while current_depth <= self.depth and time.time() - start_time < self.time_limit * 0.8:
-            for move in relevant_moves:
-                new_board = board.copy()
-                new_board.make_move(*move)
-                eval = self.minimax(new_board, current_depth - 1, alpha, beta, False, start_time)
-                
-                if eval > best_eval:
-                    best_eval = eval
-                    best_move = move
-                
-                alpha = max(alpha, eval)
-                
-                # Check if time limit is approaching
-                if time.time() - start_time > self.time_limit * 0.8:
-                    break
-            
-            current_depth += 1
-
-        # If no move was selected (due to time limit), pick a good move
-        if best_move is None and relevant_moves:
-            # Try to find a move near existing stones
-            for move in relevant_moves:
-                if self._is_relevant_move(board, move):
-                    return move
-            
-            # Fallback to center-biased random move
-            center_dist = [(move, abs(move[0]-center) + abs(move[1]-center)) for move in relevant_moves]
-            center_dist.sort(key=lambda x: x[1])
-            return center_dist[0][0]
+        # Only consider moves near existing stones, ordered by threat score;
+        # forcing moves are always kept
+        with stats.phase("ordering"):
+            relevant_moves = self.orderer.order(board, self._candidate_moves(board), 0)
+
+        stats.source = "search"
+        with stats.phase("search"):
+            if self.parallel is not None:
+                return self.parallel_search(board, relevant_moves)
+
+            # Iterative deepening with aspiration windows and PVS
+            best_move = relevant_moves[0]
+            for best_move in self._deepen(board, relevant_moves):
+                yield self._progress(board, best_move)
+            return best_move
 
-        return best_move 
\ No newline at end of file
+    def _finish_stats(self, board, move, start_time):
+        """Copy the search counters into self.stats and log them if a stats file is set."""
+        stats = self.stats
+        stats.move = move
+        stats.score = self.best_score
+        stats.stones = len(board.move_history)
+        stats.nodes = self.nodes
+        stats.threat_space_nodes = self.threat_space_nodes
+        stats.leaf_evaluations = self.leaf_evaluations
+        stats.beta_cutoffs = self.cutoffs
+        stats.first_move_cutoffs = self.first_move_cutoffs
+        stats.completed_depth = self.completed_depth
+        stats.timed_out = self.timed_out
+        stats.cancelled = self.clock.cancelled
+        if self.parallel is None:
+            stats.tt_hits = self.tt.hits - self._tt_counts[0]
+            stats.tt_misses = self.tt.misses - self._tt_counts[1]
+        stats.iterations = [
+            {"depth": depth, "score": score, "move": list(best), "nodes": nodes, "seconds": seconds}
+            for (depth, score, best), nodes, seconds
+            in zip(self.iterations, self.iteration_nodes, self.iteration_times)
+        ]
+        stats.seconds = time.time() - start_time
+        if self.stats_logger is not None:
+            self.stats_logger.log(stats, difficulty=self.difficulty)
@@ -0,0 +1,72 @@
+"""
+Gomoku AI Worker Module
+
+Runs GomokuAI searches on a background thread so the caller, such as the
+GUI's render loop, keeps running while the AI thinks. Each search works on
+a snapshot of the board, reports its progress as it deepens and can be
+cancelled; a cancelled search leaves no result behind.
+"""
+
+import threading
+
+from budget import CancelToken
+
+
+class AIWorker:
+    def __init__(self, ai):
+        self.ai = ai
+        self.thread = None
+        self.token = None
+        self.progress = None  # Latest SearchProgress of the running search
+        self.final = None  # Final SearchProgress, until collected by poll()
+        self.error = None
+
+    @property
+    def thinking(self):
+        """True from start() until the result is collected or the search is cancelled."""
+        return self.thread is not None
+
+    def start(self, board):
+        """Search for a move on a snapshot of `board`, cancelling any search already running."""
+        self.cancel()
+        self.progress = None
+        self.token = CancelToken()
+        self.thread = threading.Thread(target=self._run, args=(board.copy(), self.token), daemon=True)
+        self.thread.start()
+
+    def _run(self, board, token):
+        try:
+            for progress in self.ai.search(board, token):
+                if progress.final:
+                    self.final = progress
+                else:
+                    self.progress = progress
+        except Exception as error:
+            self.error = error
+
+    def poll(self):
+        """Return the final SearchProgress once the search has finished, else None.
+
+        Errors raised by the search are re-raised here, in the caller's thread.
+        """
+        if self.thread is None or self.thread.is_alive():
+            return None
+        self.thread = None
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+        final, self.final = self.final, None
+        return final
+
+    def cancel(self):
+        """Stop the running search, if any, and discard its result.
+
+        The search stops within a few hundred nodes; waiting for it means
+        the AI is never used by two searches at once.
+        """
+        if self.thread is None:
+            return
+        self.token.cancel()
+        self.thread.join()
+        self.thread = None
+        self.progress = self.final = self.error = None
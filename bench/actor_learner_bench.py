@@ -0,0 +1,61 @@
+"""
+Benchmark of DQN self-play throughput: the single-process train() loop
+against the actor/learner pipeline with 1, 2, 4, ... actor processes.
+
+Each configuration trains for a fixed wall-clock time on the same board
+size. Reports episodes per hour, environment steps per second and learner
+updates per second. Scaling depends on free cores, so the actor counts
+stop at the host's CPU count. Run from the repository root:
+
+    python bench/actor_learner_bench.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from actor_learner import train_actor_learner
+from dqn_agent import DQNAgent
+from gomoku_env import GomokuEnv
+
+
+def single_process(size, seconds, batch_size=64):
+    """The train() loop: act, store and learn once per environment step."""
+    env = GomokuEnv(size)
+    agent = DQNAgent(size, size * size, device="cpu")
+    episodes = steps = updates = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        state, info = env.reset()
+        done = False
+        while not done:
+            action = agent.act(state, info["action_mask"])
+            next_state, reward, done, _, info = env.step(action)
+            agent.remember(state, action, reward, next_state, done)
+            state = next_state
+            steps += 1
+            if len(agent.memory) > batch_size:
+                agent.replay(batch_size)
+                updates += 1
+        episodes += 1
+    elapsed = time.perf_counter() - start
+    return episodes / elapsed * 3600, steps / elapsed, updates / elapsed
+
+
+def main(size=15, seconds=30):
+    cpus = os.cpu_count() or 1
+    counts = [n for n in (1, 2, 4, 8, 16) if n <= max(1, cpus)]
+    print(f"{size}x{size} board, {seconds} s per configuration, {cpus} CPUs")
+    print("  mode            episodes/h    steps/s  updates/s")
+    row = "  {:<14} {:11.0f} {:10.0f} {:10.1f}"
+    print(row.format("single", *single_process(size, seconds)))
+    for actors in counts:
+        _, stats = train_actor_learner(actors, episodes=10 ** 9, size=size, save_every=None, max_seconds=seconds)
+        print(row.format(f"{actors} actors", stats["episodes_per_hour"], stats["steps_per_second"],
+                         stats["updates_per_second"]))
+
+
+if __name__ == "__main__":
+    main()
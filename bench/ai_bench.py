@@ -0,0 +1,180 @@
+"""
+Reproducible benchmark of GomokuAI.get_best_move over a fixed position corpus.
+
+bench/corpus.json holds opening, mid-game, tactical and endgame positions on
+15x15 and 19x19 boards. Every position is played at each difficulty with a
+fixed random seed and a node budget instead of a time limit, so the chosen
+moves are the same on every machine and only the timings vary. The report
+gives latency percentiles, nodes per second, threat-space search nodes and
+the moves chosen. The results are compared with a saved baseline, and the
+script exits with status 1 when latency or throughput regressed beyond the
+tolerance.
+
+Run from the repository root (no pygame or torch needed):
+
+    python bench/ai_bench.py                    # compare with bench/baseline.json
+    python bench/ai_bench.py --save-baseline    # record a new baseline
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import GomokuAI
+from board import BitBoard
+from budget import SearchBudget
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(BENCH_DIR, "corpus.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+DIFFICULTIES = ("easy", "medium", "hard")
+# Minimax nodes per move at each difficulty
+NODE_LIMITS = {"easy": 500, "medium": 2000, "hard": 4000}
+PERCENTILES = (50, 90, 99)
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def setup(position):
+    board = BitBoard(position["size"])
+    for move in position["moves"]:
+        board.make_move(*move)
+    return board
+
+
+def run(corpus, difficulties=DIFFICULTIES, seed=0):
+    """Play every position at every difficulty; return one result dict per move."""
+    results = []
+    for difficulty in difficulties:
+        budget = SearchBudget(nodes=NODE_LIMITS[difficulty])
+        for position in corpus:
+            board = setup(position)
+            # Start every position cold and with the same random state: a new
+            # AI has an empty table, move-ordering history and threat cache
+            ai = GomokuAI(difficulty=difficulty, budget=budget)
+            random.seed(seed)
+            start = time.perf_counter()
+            move = ai.get_best_move(board)
+            seconds = time.perf_counter() - start
+            stats = ai.stats
+            results.append({
+                "id": position["id"],
+                "category": position["category"],
+                "difficulty": difficulty,
+                "move": list(move),
+                "source": stats.source,
+                "depth": stats.completed_depth,
+                "nodes": stats.nodes,
+                "threat_space_nodes": stats.threat_space_nodes,
+                "threat_space_seconds": stats.phases.get("threat_space", 0.0),
+                "search_seconds": stats.phases.get("search", 0.0),
+                "seconds": seconds,
+            })
+    return results
+
+
+def summarize(results):
+    """Latency percentiles (ms) and nodes per second for each difficulty."""
+    summary = {}
+    for difficulty in sorted({result["difficulty"] for result in results}, key=DIFFICULTIES.index):
+        rows = [result for result in results if result["difficulty"] == difficulty]
+        latencies = np.array([row["seconds"] for row in rows]) * 1e3
+        search_seconds = sum(row["search_seconds"] for row in rows)
+        entry = {f"p{q}_ms": float(np.percentile(latencies, q)) for q in PERCENTILES}
+        entry["max_ms"] = float(latencies.max())
+        entry["nodes"] = sum(row["nodes"] for row in rows)
+        entry["nodes_per_second"] = entry["nodes"] / search_seconds if search_seconds else None
+        entry["threat_space_nodes"] = sum(row["threat_space_nodes"] for row in rows)
+        entry["threat_space_max_ms"] = max(row["threat_space_seconds"] for row in rows) * 1e3
+        summary[difficulty] = entry
+    return summary
+
+
+def compare(results, summary, baseline, tolerance):
+    """Return (regressions, changed moves) against a baseline run."""
+    regressions = []
+    for difficulty, entry in summary.items():
+        old = baseline["summary"].get(difficulty)
+        if old is None:
+            continue
+        for q in PERCENTILES[:2]:
+            name = f"p{q}_ms"
+            if entry[name] > old[name] * (1 + tolerance):
+                regressions.append(f"{difficulty} {name} {old[name]:.1f} -> {entry[name]:.1f}")
+        if old["nodes_per_second"] and entry["nodes_per_second"] is not None:
+            if entry["nodes_per_second"] < old["nodes_per_second"] * (1 - tolerance):
+                regressions.append(f"{difficulty} nodes/s {old['nodes_per_second']:.0f} -> "
+                                   f"{entry['nodes_per_second']:.0f}")
+
+    old_moves = {(row["id"], row["difficulty"]): row["move"] for row in baseline["results"]}
+    changed = [f"{row['id']} {row['difficulty']}: {old_moves[row['id'], row['difficulty']]} -> {row['move']}"
+               for row in results
+               if (row["id"], row["difficulty"]) in old_moves
+               and old_moves[row["id"], row["difficulty"]] != row["move"]]
+    return regressions, changed
+
+
+def report(results, summary):
+    for difficulty, entry in summary.items():
+        nps = f"{entry['nodes_per_second']:8.0f}" if entry["nodes_per_second"] else "       -"
+        print(f"{difficulty:<7} p50 {entry['p50_ms']:7.1f} ms  p90 {entry['p90_ms']:7.1f} ms  "
+              f"p99 {entry['p99_ms']:7.1f} ms  max {entry['max_ms']:7.1f} ms  {nps} nodes/s  "
+              f"threat space {entry['threat_space_nodes']:6d} nodes, max {entry['threat_space_max_ms']:6.1f} ms")
+    print()
+    print(f"{'position':<16}" + "".join(f"{difficulty:>28}" for difficulty in summary))
+    by_position = {}
+    for row in results:
+        by_position.setdefault(row["id"], {})[row["difficulty"]] = row
+    for position, rows in by_position.items():
+        cells = "".join(f"{str(tuple(rows[d]['move'])):>10} {rows[d]['source']:>12} {rows[d]['depth']:>4}"
+                        for d in summary)
+        print(f"{position:<16}{cells}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GomokuAI.get_best_move on a fixed corpus.")
+    parser.add_argument("--difficulties", nargs="+", default=list(DIFFICULTIES), choices=DIFFICULTIES)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus()
+    results = run(corpus, args.difficulties, args.seed)
+    summary = summarize(results)
+    report(results, summary)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump({"seed": args.seed, "summary": summary, "results": results}, f, indent=1)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions, changed = compare(results, summary, baseline, args.tolerance)
+    print(f"\n{len(changed)} moves differ from the baseline")
+    for line in changed:
+        print(f"  {line}")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""
+Micro-benchmark comparing the NumPy Board against the BitBoard.
+
+Run from the repository root:
+
+    python bench/board_bench.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board, BitBoard
+
+
+def random_position(board_cls, size, stones, seed):
+    """Play `stones` random moves without anyone winning."""
+    rng = random.Random(seed)
+    board = board_cls(size)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    rng.shuffle(cells)
+    for move in cells:
+        if len(board.move_history) >= stones:
+            break
+        board.make_move(*move)
+        if board.check_win():
+            board.undo_move()
+    return board
+
+
+def bench_board(board_cls, size, repeat=200):
+    """Return microseconds per call for the hot Board operations."""
+    board = random_position(board_cls, size, stones=size * 5, seed=size)
+    empty = board.get_valid_moves()[:50]
+
+    def make_undo():
+        for move in empty:
+            board.make_move(*move)
+            board.undo_move()
+
+    def valid():
+        for move in empty:
+            board.is_valid_move(*move)
+
+    def win():
+        for _ in empty:
+            board.check_win()
+
+    results = {}
+    for name, fn in (("make+undo", make_undo), ("is_valid_move", valid), ("check_win", win)):
+        seconds = min(timeit.repeat(fn, number=repeat, repeat=3))
+        results[name] = seconds / repeat / len(empty) * 1e6
+    return results
+
+
+def main():
+    for size in (15, 19):
+        print(f"{size}x{size} board (microseconds per call)")
+        base = bench_board(Board, size)
+        bits = bench_board(BitBoard, size)
+        for name in base:
+            print(f"  {name:<22} Board {base[name]:8.2f}   BitBoard {bits[name]:8.2f}   "
+                  f"x{base[name] / bits[name]:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Opening latency with and without the opening book file.
+
+Plays the first plies of a few self-play games, timing get_best_move at
+every ply, once with the book file and once without it. Also times opening
+the book, which only maps the file.
+
+Run from the repository root after building a book:
+
+    python opening_book.py opening_book.bin
+    python bench/book_bench.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import BOOK_PATH, GomokuAI
+from budget import SearchBudget
+from board import Board, symmetry_table
+from opening_book import BookReader
+
+
+def opening_latency(ai, plies, games):
+    """Mean get_best_move time per ply over `games` self-play games, and the book hit count.
+
+    Game k opens with the k-th rotation or mirror image of the book's first
+    move, so later games only hit the book through the symmetry-canonical
+    keys.
+    """
+    forward, _ = symmetry_table(15)
+    totals = [0.0] * plies
+    hits = 0
+    for game in range(games):
+        board = Board(15)
+        for ply in range(plies):
+            hits += ai.book_file is not None and ai.book_file.probe(board) is not None
+            start = time.perf_counter()
+            move = ai.get_best_move(board)
+            totals[ply] += time.perf_counter() - start
+            if ply == 0:
+                move = divmod(forward[game % 8][move[0] * 15 + move[1]], 15)
+            board.make_move(*move)
+    return [total / games for total in totals], hits
+
+
+def main(plies=10, games=4, time_limit=2.0):
+    if not os.path.exists(BOOK_PATH):
+        print(f"No book at {BOOK_PATH}; build one with opening_book.py first")
+        return
+    start = time.perf_counter()
+    book = BookReader(BOOK_PATH)
+    print(f"{len(book)} book positions, opened in {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+    for name, path in (("no book", None), ("book file", BOOK_PATH)):
+        ai = GomokuAI(difficulty="hard", book_path=path, budget=SearchBudget(seconds=time_limit))
+        latency, hits = opening_latency(ai, plies, games)
+        per_ply = " ".join(f"{seconds * 1e3:7.1f}" for seconds in latency)
+        print(f"  {name:<10} ms per ply 1-{plies}: {per_ply}   book hits {hits}/{plies * games}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark of environment stepping: N GomokuEnv copies against one
+GomokuVectorEnv holding the same N games.
+
+Both play uniformly random legal moves, so games run to their natural end
+and are reset. Reports environment steps per second (one step is one move
+in one game), timing only the step and reset calls, not the move choice.
+Run from the repository root:
+
+    python bench/env_bench.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gomoku_env import GomokuEnv, GomokuVectorEnv
+
+ENV_COUNTS = (1, 16, 64, 256)
+
+
+def single_envs(num_envs, size, steps, seed=0):
+    """Steps per second for `num_envs` GomokuEnv instances stepped one by one."""
+    rng = np.random.default_rng(seed)
+    envs = [GomokuEnv(size) for _ in range(num_envs)]
+    observations = [env.reset()[0] for env in envs]
+    elapsed = 0.0
+    for _ in range(steps):
+        actions = [rng.choice(np.flatnonzero(observation.ravel() == 0)) for observation in observations]
+        start = time.perf_counter()
+        for i, env in enumerate(envs):
+            observations[i], _, done, _, _ = env.step(actions[i])
+            if done:
+                observations[i], _ = env.reset()
+        elapsed += time.perf_counter() - start
+    return num_envs * steps / elapsed
+
+
+def vector_env(num_envs, size, steps, seed=0):
+    """Steps per second for one GomokuVectorEnv of `num_envs` games."""
+    rng = np.random.default_rng(seed)
+    env = GomokuVectorEnv(num_envs, size)
+    observations, _ = env.reset(seed=seed)
+    elapsed = 0.0
+    for _ in range(steps):
+        # A random legal move per game: the empty cell with the largest noise
+        noise = rng.random((num_envs, size * size))
+        actions = np.argmax(np.where(observations.reshape(num_envs, -1) == 0, noise, -1.0), axis=1)
+        start = time.perf_counter()
+        observations, _, _, _, _ = env.step(actions)
+        elapsed += time.perf_counter() - start
+    return num_envs * steps / elapsed
+
+
+def main(size=19, steps=200):
+    print(f"{size}x{size} board, random legal moves (environment steps per second)")
+    for num_envs in ENV_COUNTS:
+        single = single_envs(num_envs, size, steps)
+        vector = vector_env(num_envs, size, steps)
+        print(f"  N={num_envs:<4} GomokuEnv x N {single:10.0f}   GomokuVectorEnv {vector:10.0f}   "
+              f"x{vector / single:.1f}")
+
+
+if __name__ == "__main__":
+    main()
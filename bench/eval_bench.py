@@ -0,0 +1,157 @@
+"""
+Benchmark of the lookup-table evaluator against the original loop-based
+evaluate_position, and of an incremental update of IncrementalEvaluator.
+
+Run from the repository root:
+
+    python bench/eval_bench.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from evaluator import IncrementalEvaluator, get_evaluator
+from search_bench import midgame_position
+
+
+def legacy_evaluate(board):
+    """The original loop-based evaluate_position, without its cache."""
+    # Check for immediate win
+    if board.check_win():
+        score = 100000 * -board.current_player  # Opponent won
+        return score
+
+    score = 0
+    size = board.size
+    directions = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+    # Count pieces for each player using numpy
+    black_count = np.sum(board.board == 1)
+    white_count = np.sum(board.board == -1)
+
+    # Material advantage (small factor)
+    score += (black_count - white_count) * 10
+
+    # Evaluate patterns for each player
+    for player in [1, -1]:  # 1 for black, -1 for white
+        player_factor = 1 if player == 1 else -1
+
+        # Create pattern scores based on threat level
+        # Five in a row (win)
+        five_score = 100000 * player_factor
+        # Open four (one move to win)
+        open_four_score = 15000 * player_factor
+        # Blocked four (can be blocked)
+        blocked_four_score = 4000 * player_factor
+        # Open three (can create an open four)
+        open_three_score = 3000 * player_factor
+        # Blocked three
+        blocked_three_score = 1000 * player_factor
+        # Open two
+        open_two_score = 500 * player_factor
+
+        # Scan the entire board for patterns
+        for i in range(size):
+            for j in range(size):
+                if board.board[i][j] == player:
+                    # Check each direction from this position
+                    for dr, dc in directions:
+                        # Count consecutive stones and empty spaces
+                        consecutive = 1
+                        empty_before = False
+                        empty_after = False
+
+                        # Check backwards for empty space
+                        r, c = i - dr, j - dc
+                        if 0 <= r < size and 0 <= c < size and board.board[r][c] == 0:
+                            empty_before = True
+
+                        # Check forwards for consecutive stones and empty space
+                        r, c = i + dr, j + dc
+                        while 0 <= r < size and 0 <= c < size and board.board[r][c] == player:
+                            consecutive += 1
+                            r += dr
+                            c += dc
+
+                        # Check for empty space after consecutive stones
+                        if 0 <= r < size and 0 <= c < size and board.board[r][c] == 0:
+                            empty_after = True
+
+                        # Evaluate the pattern
+                        if consecutive >= 5:
+                            score += five_score
+                        elif consecutive == 4:
+                            if empty_before and empty_after:
+                                score += open_four_score
+                            elif empty_before or empty_after:
+                                score += blocked_four_score
+                        elif consecutive == 3:
+                            if empty_before and empty_after:
+                                score += open_three_score
+                            elif empty_before or empty_after:
+                                score += blocked_three_score
+                        elif consecutive == 2:
+                            if empty_before and empty_after:
+                                score += open_two_score
+
+    # Center control bonus (weighted by distance from center)
+    center = size // 2
+    for i in range(size):
+        for j in range(size):
+            if board.board[i][j] != 0:
+                # Distance from center (smaller is better)
+                distance = abs(i - center) + abs(j - center)
+                # Maximum distance could be 2*center
+                distance_factor = 1 - (distance / (2 * center))
+                # Apply center control bonus
+                score += board.board[i][j] * 50 * distance_factor
+
+    # Proximity to opponent's stones
+    # Encourage play near opponent's pieces
+    for i in range(size):
+        for j in range(size):
+            if board.board[i][j] == 0:  # Empty spot
+                # Check surrounding squares for opponent pieces
+                for di in [-1, 0, 1]:
+                    for dj in [-1, 0, 1]:
+                        ni, nj = i + di, j + dj
+                        if 0 <= ni < size and 0 <= nj < size and board.board[ni][nj] == -board.current_player:
+                            # Empty spots next to opponent pieces are valuable
+                            score += board.current_player * 5
+
+    return score
+
+
+def main(number=20):
+    for size in (15, 19):
+        positions = [midgame_position(size, stones=10 + 5 * seed, seed=seed) for seed in range(6)]
+        evaluator = get_evaluator(size)
+        legacy = min(timeit.repeat(lambda: [legacy_evaluate(p) for p in positions], number=number, repeat=3))
+        vector = min(timeit.repeat(lambda: [evaluator.evaluate(p) for p in positions], number=number, repeat=3))
+        calls = number * len(positions)
+        print(f"{size}x{size}: legacy {legacy / calls * 1e6:8.1f} us/eval   "
+              f"table {vector / calls * 1e6:8.1f} us/eval   x{legacy / vector:.1f}")
+        for position in positions:
+            print(f"    {len(position.move_history):3d} stones   legacy {legacy_evaluate(position):9.1f}"
+                  f"   table {evaluator.evaluate(position):7d}")
+
+        board = positions[-1].copy()
+        incremental = IncrementalEvaluator(board)
+        move = board.get_candidate_moves()[0]
+
+        def update():
+            board.make_move(*move)
+            incremental.score()
+            board.undo_move()
+
+        seconds = min(timeit.repeat(update, number=number * 50, repeat=3))
+        print(f"    incremental make + score + undo {seconds / (number * 50) * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
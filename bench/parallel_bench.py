@@ -0,0 +1,57 @@
+"""
+Speedup of the parallel root search over the single-process search.
+
+Every configuration searches the same mid-game positions to a fixed depth
+with no time limit; the table shows the wall-clock time and the speedup
+against one worker. Worker pools are started (and warmed up) before timing.
+
+Run from the repository root:
+
+    python bench/parallel_bench.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_bench import midgame_position
+from ai import GomokuAI
+from budget import SearchBudget
+
+WORKER_COUNTS = (1, 2, 4, 8, 16)
+
+
+def fixed_depth_time(ai, positions, depth):
+    """Seconds to search every position to `depth`, plus the moves chosen."""
+    ai.depth = depth
+    ai.budget = SearchBudget()
+    chosen = []
+    start = time.perf_counter()
+    for position in positions:
+        board = ai.new_search(position)
+        moves = ai.orderer.order(board, ai._candidate_moves(board), 0)
+        if ai.parallel is not None:
+            chosen.append(ai.parallel_search(board, moves))
+        else:
+            chosen.append(ai.iterative_deepening(board, moves))
+    return time.perf_counter() - start, chosen
+
+
+def main(depth=4):
+    positions = [midgame_position(15, stones=20 + 2 * seed, seed=seed) for seed in range(6)]
+    print(f"15x15, depth {depth}, {len(positions)} mid-game positions, {os.cpu_count()} CPUs")
+    baseline = None
+    for workers in WORKER_COUNTS:
+        ai = GomokuAI(difficulty="hard", workers=workers)
+        # Warm up the pool so process start-up is not timed
+        fixed_depth_time(ai, positions[:1], 1)
+        seconds, chosen = fixed_depth_time(ai, positions, depth)
+        ai.close()
+        baseline = baseline or seconds
+        print(f"  {workers:2d} workers  {seconds:6.2f}s  speedup {baseline / seconds:5.2f}x  moves {chosen}")
+
+
+if __name__ == "__main__":
+    main()
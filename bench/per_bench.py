@@ -0,0 +1,66 @@
+"""
+Benchmark of prioritized replay at 1M capacity.
+
+Fills a SumTree and a 19x19 PrioritizedReplayBuffer with random
+priorities. Reports throughput, in transitions per second, of proportional
+lookups, of batched priority updates and of full minibatch sampling. The
+full sampling includes the board gather, and is compared with the uniform
+ReplayBuffer. Run from the repository root:
+
+    python bench/per_bench.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+
+BATCH_SIZES = (64, 256, 1024)
+
+
+def per_second(fn, batch_size, seconds=0.5):
+    """Transitions per second handled by calling fn() on batches of `batch_size`."""
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        calls += 1
+    return calls * batch_size / (time.perf_counter() - start)
+
+
+def filled(buffer, rng):
+    """Mark every slot of `buffer` as used; the boards themselves stay empty."""
+    buffer.size = buffer.capacity
+    buffer.actions[:] = rng.integers(0, buffer.states[0].size, buffer.capacity)
+    return buffer
+
+
+def main(capacity=1_000_000, size=19):
+    rng = np.random.default_rng(0)
+    tree = SumTree(capacity)
+    start = time.perf_counter()
+    tree.update(np.arange(capacity), rng.random(capacity))
+    print(f"capacity {capacity}, tree depth {tree.depth}, built in {time.perf_counter() - start:.2f} s")
+
+    prioritized = filled(PrioritizedReplayBuffer(capacity, (size, size), seed=0), rng)
+    prioritized.tree = tree
+    uniform = filled(ReplayBuffer(capacity, (size, size), seed=0), rng)
+
+    print("  batch   tree.find/s   tree.update/s   PER sample/s   uniform sample/s")
+    for batch_size in BATCH_SIZES:
+        indices = rng.integers(0, capacity, batch_size)
+        priorities = rng.random(batch_size)
+        find = per_second(lambda: tree.find(rng.random(batch_size) * tree.total), batch_size)
+        update = per_second(lambda: tree.update(indices, priorities), batch_size)
+        per = per_second(lambda: prioritized.sample(batch_size), batch_size)
+        flat = per_second(lambda: uniform.sample(batch_size), batch_size)
+        print(f"  {batch_size:5d} {find:13.0f} {update:15.0f} {per:14.0f} {flat:18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark of DQN replay storage: the previous deque of (state, action,
+reward, next_state, done) tuples against ReplayBuffer.
+
+Both are filled with the same self-play transitions on a 19x19 board.
+Reports memory per transition (traced allocations) and the latency of
+sampling a minibatch into float32/int64 arrays, the step before building
+tensors. Run from the repository root:
+
+    python bench/replay_bench.py
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gomoku_env import GomokuEnv
+from replay_buffer import ReplayBuffer
+
+
+def transitions(count, size, seed=0):
+    """Yield `count` random self-play transitions as GomokuEnv returns them."""
+    rng = np.random.default_rng(seed)
+    env = GomokuEnv(size)
+    state, info = env.reset()
+    for _ in range(count):
+        action = int(rng.choice(np.flatnonzero(info["action_mask"])))
+        next_state, reward, done, _, info = env.step(action)
+        yield state, action, reward, next_state, done
+        state = next_state
+        if done:
+            state, info = env.reset()
+
+
+def fill(memory, add, count, size):
+    """Bytes allocated while adding `count` transitions with `add`."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for transition in transitions(count, size):
+        add(*transition)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def deque_sample(memory, batch_size):
+    minibatch = random.sample(memory, batch_size)
+    return (np.array([x[0] for x in minibatch], dtype=np.float32),
+            np.array([x[1] for x in minibatch]),
+            np.array([x[2] for x in minibatch], dtype=np.float32),
+            np.array([x[3] for x in minibatch], dtype=np.float32),
+            np.array([x[4] for x in minibatch], dtype=np.float32))
+
+
+def sample_latency(sample, batch_size, repeat=500):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        sample(batch_size)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main(size=19, count=10000, batch_size=64):
+    memory = deque(maxlen=count)
+    deque_bytes = fill(memory, lambda *t: memory.append(t), count, size)
+    # The preallocated arrays are part of the buffer's cost, so allocate them while tracing
+    tracemalloc.start()
+    buffer = ReplayBuffer(count, (size, size), seed=0)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    buffer_bytes = allocated + fill(buffer, buffer.add, count, size)
+
+    print(f"{count} transitions on {size}x{size}")
+    print(f"  bytes per transition   deque {deque_bytes / count:8.0f}   ReplayBuffer {buffer_bytes / count:8.0f}   "
+          f"x{deque_bytes / buffer_bytes:.1f}")
+    print(f"  capacity in the deque's RAM: {int(deque_bytes / (buffer_bytes / count))} transitions")
+    deque_us = sample_latency(lambda n: deque_sample(memory, n), batch_size)
+    buffer_us = sample_latency(buffer.sample, batch_size)
+    print(f"  sample({batch_size}) microseconds deque {deque_us:8.1f}   ReplayBuffer {buffer_us:8.1f}   "
+          f"x{deque_us / buffer_us:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Node-throughput comparison of the in-place make/unmake search against the
+original search that copied the board for every child, plus move-ordering
+quality and a time-limited comparison of iterative deepening drivers.
+
+Run from the repository root:
+
+    python bench/search_bench.py
+"""
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import INFINITY, GomokuAI
+from board import Board
+from budget import SearchBudget
+from evaluator import BLOCKED, BLOCKED_FOUR, PATTERN_TABLE, POWERS, VIEW, get_evaluator
+
+
+class CopySearchAI(GomokuAI):
+    """Reference minimax that allocates a board copy per child, as before."""
+
+    def new_search(self, board, start_time=None):
+        self.nodes = 0
+        self.clock = self.budget.start(start_time)
+        return board.copy()
+
+    def minimax(self, board, depth, alpha, beta, ply=1):
+        self.nodes += 1
+        if self.clock.deadline is not None and time.time() > self.clock.deadline:
+            return 0
+        if depth == 0 or board.check_win():
+            return self.evaluate_position(board) * board.current_player
+
+        valid_moves = board.get_valid_moves()
+        if not valid_moves:
+            return 0
+        relevant_moves = [move for move in valid_moves if self._is_relevant_move(board, move)]
+        if not relevant_moves:
+            relevant_moves = valid_moves
+        if len(relevant_moves) > 12:
+            center = board.size // 2
+            relevant_moves.sort(key=lambda m: abs(m[0] - center) + abs(m[1] - center))
+            relevant_moves = relevant_moves[:12]
+
+        best = -INFINITY
+        for move in relevant_moves:
+            new_board = board.copy()
+            new_board.make_move(*move)
+            eval = -self.minimax(new_board, depth - 1, -beta, -alpha, ply + 1)
+            best = max(best, eval)
+            alpha = max(alpha, eval)
+            if beta <= alpha:
+                break
+        return best
+
+
+class LegacyDeepeningAI(GomokuAI):
+    """The previous driver: alpha and the best score carry over between depths."""
+
+    def iterative_deepening(self, board, moves):
+        best_move = None
+        best_eval = -INFINITY
+        alpha = -INFINITY
+        current_depth = 1
+        time_limit = self.budget.seconds
+        while current_depth <= self.depth and self.clock.elapsed() < time_limit * 0.8:
+            for move in moves:
+                board.make_move(*move)
+                eval = -self.minimax(board, current_depth - 1, -INFINITY, -alpha)
+                board.undo_move()
+                if eval > best_eval:
+                    best_eval = eval
+                    best_move = move
+                alpha = max(alpha, eval)
+                if self.clock.elapsed() > time_limit * 0.8:
+                    break
+            else:
+                self.completed_depth = current_depth
+            self.timed_out = False
+            current_depth += 1
+        return best_move
+
+
+def has_four(board):
+    """True if either player has four stones in some five-cell stretch."""
+    evaluator = get_evaluator(board.size)
+    grid = board.board.ravel()
+    for player in (1, -1):
+        cells = np.append(VIEW[player][grid + 1], BLOCKED)
+        if (PATTERN_TABLE[cells[evaluator.windows] @ POWERS] >= BLOCKED_FOUR).any():
+            return True
+    return False
+
+
+def midgame_position(size, stones, seed):
+    """Scatter `stones` stones around the centre without anyone having a four."""
+    rng = random.Random(seed)
+    board = Board(size)
+    center = size // 2
+    while len(board.move_history) < stones:
+        move = (center + rng.randint(-4, 4), center + rng.randint(-4, 4))
+        if board.make_move(*move) and has_four(board):
+            board.undo_move()
+    return board
+
+
+def throughput(ai_cls, positions, depth):
+    """Return (nodes, seconds) for a fixed-depth search of every position."""
+    ai = ai_cls(difficulty="hard", budget=SearchBudget())
+    start = time.perf_counter()
+    nodes = 0
+    for position in positions:
+        ai.tt.clear()
+        board = ai.new_search(position)
+        ai.minimax(board, depth, -INFINITY, INFINITY)
+        nodes += ai.nodes
+    return nodes, time.perf_counter() - start
+
+
+def ordering_quality(positions, depth):
+    """Deepen each position to `depth` and report move-ordering statistics."""
+    ai = GomokuAI(difficulty="hard", budget=SearchBudget())
+    factors, cutoffs, first = [], 0, 0
+    for position in positions:
+        board = ai.new_search(position)
+        for current_depth in range(1, depth + 1):
+            before = ai.nodes
+            ai.minimax(board, current_depth, -INFINITY, INFINITY, ply=0)
+            ai.iteration_nodes.append(ai.nodes - before)
+        report = ai.search_report()
+        factors.append(report["effective_branching_factor"])
+        cutoffs += ai.cutoffs
+        first += ai.first_move_cutoffs
+    return sum(factors) / len(factors), first / cutoffs if cutoffs else 0.0
+
+
+def deepening(ai_cls, positions, time_limit):
+    """Average depth completed by a driver within `time_limit` per position."""
+    ai = ai_cls(difficulty="hard", budget=SearchBudget(seconds=time_limit))
+    ai.depth = 20
+    depths = []
+    for position in positions:
+        ai.tt.clear()
+        board = ai.new_search(position)
+        moves = ai.orderer.order(board, ai._candidate_moves(board), 0)
+        ai.iterative_deepening(board, moves)
+        depths.append(ai.completed_depth)
+    return sum(depths) / len(depths)
+
+
+def main(depth=3):
+    for size in (15, 19):
+        positions = [midgame_position(size, stones=20 + 2 * seed, seed=seed) for seed in range(5)]
+        print(f"{size}x{size}, depth {depth}, {len(positions)} mid-game positions")
+        for name, ai_cls in (("copy per node", CopySearchAI), ("make/unmake", GomokuAI)):
+            nodes, seconds = throughput(ai_cls, positions, depth)
+            print(f"  {name:<14} {nodes:7d} nodes  {seconds:6.2f}s  {nodes / seconds:8.0f} nodes/s")
+        factor, first = ordering_quality(positions, depth + 1)
+        print(f"  effective branching factor {factor:.2f}, cutoffs on first move {first:.1%}")
+        for name, ai_cls in (("previous driver", LegacyDeepeningAI), ("aspiration+PVS", GomokuAI)):
+            print(f"  {name:<16} completed depth {deepening(ai_cls, positions, 1.0):.1f} in 1s")
+
+
+if __name__ == "__main__":
+    main()
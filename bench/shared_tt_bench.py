@@ -0,0 +1,90 @@
+"""
+File-backed transposition table: warm restarts and concurrent writers.
+
+The first part searches a set of positions with a fresh table file, then
+again from a new GomokuAI that reopens the same file, as a later session
+would. The second part runs several processes hammering one file at once
+and checks that no probe ever returns another position's entry.
+
+Run from the repository root:
+
+    python bench/shared_tt_bench.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_bench import midgame_position
+from ai import GomokuAI
+from budget import SearchBudget
+from transposition import LOWER, SharedTranspositionTable
+
+
+def search_all(ai, positions, depth):
+    """Nodes and seconds for a fixed-depth iterative deepening of every position."""
+    ai.depth = depth
+    ai.budget = SearchBudget()
+    nodes = 0
+    start = time.perf_counter()
+    for position in positions:
+        board = ai.new_search(position)
+        moves = ai.orderer.order(board, ai._candidate_moves(board), 0)
+        ai.iterative_deepening(board, moves)
+        nodes += ai.nodes
+    return nodes, time.perf_counter() - start
+
+
+def hammer(args):
+    """Store and probe random keys whose data is derived from the key; count mismatches."""
+    path, seed, operations = args
+    table = SharedTranspositionTable(path)
+    rng = random.Random(seed)
+    keys = [rng.getrandbits(64) for _ in range(operations // 4)]
+    wrong = hits = 0
+    for _ in range(operations):
+        key = rng.choice(keys)
+        if rng.random() < 0.5:
+            table.store(key, key % 7, LOWER, key % 10007, key % 225)
+        else:
+            entry = table.probe(key)
+            if entry is not None:
+                hits += 1
+                # Other processes store the same key with the same data
+                wrong += entry[2:] != (key % 10007, key % 225)
+    table.close()
+    return hits, wrong
+
+
+def main(depth=4, processes=4, operations=200000):
+    positions = [midgame_position(15, stones=20 + 2 * seed, seed=seed) for seed in range(6)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tt.bin")
+        print(f"15x15, depth {depth}, {len(positions)} mid-game positions")
+        nodes, seconds = search_all(GomokuAI(difficulty="hard"), positions, depth)
+        print(f"  in-memory table     {nodes:7d} nodes  {seconds:6.2f}s")
+        for session in ("cold file", "warm file (restart)"):
+            ai = GomokuAI(difficulty="hard", tt_path=path)
+            nodes, seconds = search_all(ai, positions, depth)
+            ai.close()
+            print(f"  {session:<19} {nodes:7d} nodes  {seconds:6.2f}s")
+
+        path = os.path.join(directory, "shared.bin")
+        SharedTranspositionTable(path, size_mb=1).close()
+        start = time.perf_counter()
+        with Pool(processes) as pool:
+            results = pool.map(hammer, [(path, seed, operations) for seed in range(processes)])
+        seconds = time.perf_counter() - start
+        hits = sum(hit for hit, _ in results)
+        wrong = sum(bad for _, bad in results)
+        print(f"{processes} processes x {operations} operations on one file in {seconds:.2f}s: "
+              f"{hits} hits, {wrong} wrong entries")
+
+
+if __name__ == "__main__":
+    main()
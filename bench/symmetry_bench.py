@@ -0,0 +1,99 @@
+"""
+Cache hits gained by keying positions on their canonical (symmetry-reduced) key.
+
+A few quick self-play games are recorded first; the opening book picks
+among symmetric replies at random, so games start in different
+orientations. Every position of every game is then searched with one
+transposition table shared across the whole run, once keyed on the plain
+Zobrist hash and once on the canonical key.
+
+Run from the repository root:
+
+    python bench/symmetry_bench.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import GomokuAI
+from budget import SearchBudget
+from board import Board
+
+
+class PlainKeyBoard(Board):
+    """Board whose canonical key is just its own hash, as before symmetry reduction."""
+
+    @property
+    def canonical_key(self):
+        return self.hash_key
+
+    @property
+    def canonical_transform(self):
+        return 0
+
+    def canonical_transforms(self):
+        return [0]
+
+
+def record_games(games, size=15, moves=24, time_limit=0.1):
+    """Play short self-play games and return their move lists."""
+    ai = GomokuAI(difficulty="medium", budget=SearchBudget(seconds=time_limit))
+    recorded = []
+    for seed in range(games):
+        random.seed(seed)
+        board = Board(size)
+        while len(board.move_history) < moves and not board.check_win():
+            board.make_move(*ai.get_best_move(board))
+        recorded.append([(row, col) for row, col, _ in board.move_history])
+    return recorded
+
+
+def positions(board_cls, games, size=15):
+    for game in games:
+        board = board_cls(size)
+        for move in game:
+            yield board
+            board.make_move(*move)
+
+
+def distinct_positions(board_cls, games):
+    """Share of positions already seen earlier in the recorded games."""
+    seen, repeats, total = set(), 0, 0
+    for board in positions(board_cls, games):
+        key = board.canonical_key
+        repeats += key in seen
+        seen.add(key)
+        total += 1
+    return repeats / total
+
+
+def search_hit_rate(board_cls, games, depth):
+    """TT hit rate over fixed-depth searches of every recorded position."""
+    ai = GomokuAI(difficulty="hard", budget=SearchBudget())
+    ai.depth = depth
+    start = time.perf_counter()
+    nodes = 0
+    for position in positions(board_cls, games):
+        board = ai.new_search(position)
+        moves = ai.orderer.order(board, ai._candidate_moves(board), 0)
+        ai.iterative_deepening(board, moves)
+        nodes += ai.nodes
+    return ai.tt.stats()["hit_rate"], nodes, time.perf_counter() - start
+
+
+def main(games=8, depth=3):
+    recorded = record_games(games)
+    print(f"{games} recorded games, {sum(map(len, recorded))} positions, depth {depth}")
+    for name, board_cls in (("plain hash", PlainKeyBoard), ("canonical key", Board)):
+        repeats = distinct_positions(board_cls, recorded)
+        hit_rate, nodes, seconds = search_hit_rate(board_cls, recorded, depth)
+        print(f"  {name:<14} repeated positions {repeats:6.1%}  TT hit rate {hit_rate:6.1%}  "
+              f"{nodes:7d} nodes  {seconds:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""
+Timing of the vectorised threat scan at different game stages.
+
+Run from the repository root:
+
+    python bench/threat_bench.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board_bench import random_position
+from board import Board
+from threats import find_threat_move
+
+
+def main(number=200):
+    for size in (15, 19):
+        print(f"{size}x{size} board")
+        for stones in (0, size, size * 4, size * size // 2):
+            board = random_position(Board, size, stones=stones, seed=stones)
+            seconds = min(timeit.repeat(lambda: find_threat_move(board, board.current_player),
+                                        number=number, repeat=3))
+            print(f"  {len(board.move_history):4d} stones   {seconds / number * 1e3:6.2f} ms per scan")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Solve times for the threat-space search on a set of VCF puzzles.
+
+Each puzzle is a 15x15 position from a random midgame in which the side to
+move wins by continuous fours. The solver's line is replayed against the
+board to check that every defence was forced and that it ends in a win.
+
+Run from the repository root:
+
+    python bench/vcf_bench.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board import Board
+from threat_space import ThreatSpaceSearch
+
+# Moves from the empty board; the side to move has a VCF
+PUZZLES = [
+    [(10, 7), (3, 3), (5, 10), (8, 8), (3, 7), (10, 6), (9, 11), (11, 4), (6, 11), (7, 4), (9, 8), (4, 8), (9, 7), (10, 4), (6, 7), (4, 3)],
+    [(10, 9), (6, 7), (3, 9), (7, 10), (10, 6), (4, 8), (7, 6), (8, 11), (3, 3), (9, 9), (6, 8), (11, 10), (3, 4), (9, 5), (4, 6), (4, 7), (4, 11), (4, 3), (3, 6), (10, 10), (5, 9), (10, 11), (3, 10), (9, 6), (10, 8)],
+    [(10, 8), (11, 11), (9, 10), (3, 5), (5, 10), (3, 8), (7, 8), (6, 7), (5, 4), (6, 11), (7, 11), (5, 8), (5, 9), (6, 10), (3, 11), (9, 8), (4, 5), (3, 9), (7, 7), (5, 6), (10, 4), (6, 6), (3, 3), (9, 11), (5, 5), (4, 9), (9, 6), (8, 10), (9, 7), (6, 4)],
+    [(6, 6), (7, 8), (3, 9), (10, 11), (10, 6), (3, 10), (7, 4), (9, 3), (11, 5), (6, 11), (10, 7), (8, 8), (4, 6), (10, 9), (10, 10), (11, 8), (7, 3), (9, 9), (8, 5), (9, 5), (5, 7), (7, 6), (6, 5), (11, 3), (6, 7)],
+    [(4, 3), (7, 4), (11, 10), (6, 3), (5, 4), (3, 3), (5, 6), (4, 5), (9, 11), (10, 4), (7, 8), (3, 6), (9, 7), (11, 11), (9, 9), (3, 8), (6, 6), (8, 3)],
+    [(10, 7), (10, 6), (6, 8), (7, 5), (9, 3), (3, 3), (8, 10), (6, 11), (5, 5), (11, 9), (9, 11), (9, 9), (7, 7), (8, 7), (10, 11), (6, 10), (6, 9), (4, 4), (3, 9), (6, 6), (3, 6), (5, 9), (3, 10), (7, 9), (7, 10)],
+    [(8, 6), (7, 7), (4, 7), (11, 5), (8, 9), (5, 7), (10, 5), (3, 7), (5, 5), (9, 9), (10, 7), (5, 10), (11, 4), (4, 10), (9, 11), (8, 4), (4, 4), (6, 4), (5, 3), (11, 11), (6, 9), (7, 11), (10, 11), (5, 11), (8, 7), (7, 6), (5, 6)],
+    [(10, 10), (9, 9), (10, 9), (5, 6), (8, 9), (4, 6), (8, 6), (5, 10), (9, 11), (6, 9), (9, 5), (5, 7), (4, 9), (9, 6), (9, 10), (6, 3), (5, 11), (10, 6), (6, 5), (7, 7), (4, 10), (3, 9), (9, 3), (7, 6), (7, 5)],
+    [(7, 9), (11, 4), (11, 7), (5, 6), (9, 6), (3, 8), (10, 3), (11, 11), (8, 9), (9, 9), (4, 9), (5, 7), (4, 11), (5, 8), (4, 3), (8, 4), (11, 3), (10, 4), (8, 5), (9, 7), (6, 11), (10, 6), (5, 5), (4, 8), (10, 9), (11, 9), (7, 8), (9, 3), (4, 5), (8, 8)],
+    [(8, 7), (4, 3), (3, 11), (6, 8), (6, 6), (4, 4), (7, 11), (4, 11), (5, 7), (7, 4), (10, 9), (9, 3), (4, 5), (4, 10), (4, 7), (5, 3), (11, 4), (7, 5), (8, 11), (9, 7), (5, 5), (9, 11), (10, 7), (8, 9), (8, 6), (10, 11), (5, 4), (6, 10), (8, 10), (10, 3)],
+    [(5, 10), (7, 5), (6, 10), (7, 10), (9, 10), (7, 3), (9, 4), (10, 7), (8, 5), (6, 8), (4, 8), (10, 10), (6, 7), (10, 6), (10, 11), (6, 6), (3, 10), (8, 6), (7, 4)],
+    [(5, 10), (6, 10), (8, 4), (8, 6), (4, 10), (5, 3), (5, 6), (11, 9), (7, 9), (10, 8), (8, 9), (6, 7), (8, 5), (3, 5), (3, 10), (6, 3), (11, 7), (3, 7), (5, 9), (9, 5), (11, 4), (8, 3), (10, 4), (3, 3), (10, 3), (6, 5), (7, 5), (9, 9), (7, 3)],
+]
+
+
+def setup(moves, size=15):
+    board = Board(size)
+    for move in moves:
+        board.make_move(*move)
+    return board
+
+
+def check_line(board, line, solver):
+    """Replay a VCF line: each defence must be the only block and the attacker must win."""
+    board = board.copy()
+    attacker = board.current_player
+    for k, move in enumerate(line):
+        if k % 2 and [move] != solver.five_points(board, attacker):
+            return False
+        if not board.make_move(*move):
+            return False
+    if board.check_win():
+        return True
+    # Ended on an open or double four: two fives the defender cannot both block
+    return len(solver.five_points(board, attacker)) >= 2
+
+
+def main():
+    print("puzzle  stones  line  nodes    ms  ok")
+    total = 0.0
+    for number, moves in enumerate(PUZZLES, 1):
+        board = setup(moves)
+        # Fresh solver per puzzle so the cache does not carry over
+        solver = ThreatSpaceSearch()
+        start = time.perf_counter()
+        line = solver.solve(board, "vcf")
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        ok = line is not None and check_line(board, line, solver)
+        length = len(line) if line else 0
+        print(f"{number:6d}  {len(moves):6d}  {length:4d}  {solver.nodes:5d}  {elapsed * 1e3:5.1f}  {'yes' if ok else 'NO'}")
+    print(f"total {total * 1e3:.1f} ms for {len(PUZZLES)} puzzles")
+
+
+if __name__ == "__main__":
+    main()
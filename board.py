@@ -4,8 +4,101 @@ Author: TJ Qiu
 Copyright © 2023 TJ Qiu. All rights reserved.
 """
 
+import random
+
 import numpy as np
 
+_zobrist_tables = {}
+
+
+def zobrist_table(size):
+    """Return the (per-player cell keys, side-to-move key) table for a board size.
+
+    Keys are 64-bit and drawn from a fixed seed so hashes are reproducible
+    across runs and processes.
+    """
+    if size not in _zobrist_tables:
+        rng = random.Random(0x60D0 + size)
+        cells = {player: [rng.getrandbits(64) for _ in range(size * size)] for player in (1, -1)}
+        _zobrist_tables[size] = (cells, rng.getrandbits(64))
+    return _zobrist_tables[size]
+
+
+_symmetries = {}
+
+
+def symmetry_table(size):
+    """Return (forward, inverse) flat-index maps for the 8 symmetries of the board.
+
+    forward[t][i] is the cell that transform t (rotations, then mirror
+    images) sends cell i to, and inverse[t] maps it back. Transform 0 is
+    the identity.
+    """
+    if size not in _symmetries:
+        n = size - 1
+        transforms = (
+            lambda r, c: (r, c),
+            lambda r, c: (c, n - r),
+            lambda r, c: (n - r, n - c),
+            lambda r, c: (n - c, r),
+            lambda r, c: (r, n - c),
+            lambda r, c: (c, r),
+            lambda r, c: (n - r, c),
+            lambda r, c: (n - c, n - r),
+        )
+        forward, inverse = [], []
+        for transform in transforms:
+            table = [0] * (size * size)
+            back = [0] * (size * size)
+            for r in range(size):
+                for c in range(size):
+                    tr, tc = transform(r, c)
+                    table[r * size + c] = tr * size + tc
+                    back[tr * size + tc] = r * size + c
+            forward.append(table)
+            inverse.append(back)
+        _symmetries[size] = (forward, inverse)
+    return _symmetries[size]
+
+
+_symmetry_keys = {}
+
+
+def symmetry_keys(size):
+    """Return, per player and cell, the 8 Zobrist keys XORed in when a stone is placed.
+
+    Key t belongs to the cell the stone lands on under transform t and
+    already includes the side-to-move key, so key 0 updates the ordinary
+    position hash.
+    """
+    if size not in _symmetry_keys:
+        cells, side = zobrist_table(size)
+        forward, _ = symmetry_table(size)
+        _symmetry_keys[size] = {
+            player: [tuple(cells[player][table[index]] ^ side for table in forward)
+                     for index in range(size * size)]
+            for player in (1, -1)
+        }
+    return _symmetry_keys[size]
+
+
+_neighbourhoods = {}
+
+
+def neighbourhood_table(size, radius=2):
+    """Return, for every flat cell index, the flat indices within `radius` of it."""
+    key = (size, radius)
+    if key not in _neighbourhoods:
+        table = []
+        for r in range(size):
+            for c in range(size):
+                table.append([i * size + j
+                              for i in range(max(0, r - radius), min(size, r + radius + 1))
+                              for j in range(max(0, c - radius), min(size, c + radius + 1))])
+        _neighbourhoods[key] = table
+    return _neighbourhoods[key]
+
+
 class Board:
     def __init__(self, size=19):
         self.size = size
@@ -13,11 +106,71 @@ class Board:
         self.last_move = None
         self.current_player = 1  # 1 for black, -1 for white
         self.move_history = []  # Store move history for undo functionality
+        self.zobrist_cells, self.zobrist_side = zobrist_table(size)
+        # Zobrist key of the position under each of the 8 symmetries,
+        # updated together; _hashes[0] is the position as it stands
+        self.symmetry_keys = symmetry_keys(size)
+        self._hashes = [0] * 8
+        # Candidate frontier: empty cells within distance 2 of any stone.
+        # near_count[i] is the number of stones in the 5x5 box around cell i.
+        self.neighbourhood = neighbourhood_table(size)
+        self.near_count = [0] * (size * size)
+        self.frontier = set()
+        # Optional evaluator.IncrementalEvaluator notified of every stone
+        self.evaluator = None
+
+    @property
+    def hash_key(self):
+        """64-bit Zobrist key of the stones on the board and the side to move."""
+        return self._hashes[0]
+
+    @property
+    def canonical_key(self):
+        """Smallest Zobrist key over the 8 rotations and mirror images of the position.
+
+        Equal for every position that is a symmetry of this one, so caches
+        keyed on it share entries between them.
+        """
+        return min(self._hashes)
+
+    @property
+    def canonical_transform(self):
+        """Index of the symmetry that takes this position to its canonical frame."""
+        hashes = self._hashes
+        return hashes.index(min(hashes))
+
+    def canonical_transforms(self):
+        """Every symmetry taking this position to its canonical frame.
+
+        More than one means the position is symmetric itself.
+        """
+        key = min(self._hashes)
+        return [t for t, hash_key in enumerate(self._hashes) if hash_key == key]
+
+    def to_canonical(self, move, transform=None):
+        """Map a (row, col) move on this board into the canonical frame."""
+        if transform is None:
+            transform = self.canonical_transform
+        forward, _ = symmetry_table(self.size)
+        return divmod(forward[transform][move[0] * self.size + move[1]], self.size)
+
+    def from_canonical(self, move, transform=None):
+        """Map a (row, col) move in the canonical frame back onto this board."""
+        if transform is None:
+            transform = self.canonical_transform
+        _, inverse = symmetry_table(self.size)
+        return divmod(inverse[transform][move[0] * self.size + move[1]], self.size)
 
     def make_move(self, row, col):
         if self.is_valid_move(row, col):
             self.board[row][col] = self.current_player
             self.last_move = (row, col)
+            index = row * self.size + col
+            keys = self.symmetry_keys[self.current_player][index]
+            self._hashes = [h ^ k for h, k in zip(self._hashes, keys)]
+            self._add_to_frontier(index)
+            if self.evaluator is not None:
+                self.evaluator.stone_placed(index, self.current_player)
             # Store the move in history
             self.move_history.append((row, col, self.current_player))
             self.current_player *= -1
@@ -66,6 +219,32 @@ class Board:
         
         return False
 
+    def _add_to_frontier(self, index):
+        near_count = self.near_count
+        frontier = self.frontier
+        for i in self.neighbourhood[index]:
+            near_count[i] += 1
+            if near_count[i] == 1:
+                frontier.add(i)
+        frontier.discard(index)
+
+    def _remove_from_frontier(self, index):
+        near_count = self.near_count
+        frontier = self.frontier
+        for i in self.neighbourhood[index]:
+            near_count[i] -= 1
+            if near_count[i] == 0:
+                frontier.discard(i)
+        if near_count[index]:
+            frontier.add(index)
+
+    def get_candidate_moves(self):
+        """Return the empty cells within distance 2 of a stone, in row-major order."""
+        return [divmod(i, self.size) for i in sorted(self.frontier)]
+
+    def is_full(self):
+        return len(self.move_history) == self.size * self.size
+
     def get_valid_moves(self):
         moves = []
         for i in range(self.size):
@@ -75,11 +254,14 @@ class Board:
         return moves
 
     def copy(self):
-        new_board = Board(self.size)
+        new_board = type(self)(self.size)
         new_board.board = self.board.copy()
         new_board.last_move = self.last_move
         new_board.current_player = self.current_player
         new_board.move_history = self.move_history.copy()
+        new_board._hashes = self._hashes.copy()
+        new_board.near_count = self.near_count.copy()
+        new_board.frontier = self.frontier.copy()
         return new_board
 
     def __str__(self):
@@ -99,6 +281,12 @@ class Board:
         
         # Clear the position
         self.board[row][col] = 0
+        index = row * self.size + col
+        keys = self.symmetry_keys[player][index]
+        self._hashes = [h ^ k for h, k in zip(self._hashes, keys)]
+        self._remove_from_frontier(index)
+        if self.evaluator is not None:
+            self.evaluator.stone_removed(index, player)
         
         # Update the current player
         self.current_player = player
@@ -109,4 +297,73 @@ class Board:
         else:
             self.last_move = None
             
-        return True 
\ No newline at end of file
+        return True 
+
+class BitBoard(Board):
+    """Board backed by one bitboard per player.
+
+    Each player's stones are packed into a Python int, one bit per cell with
+    rows laid out ``size + 1`` bits apart. The spare bit at the end of every
+    row is always zero, which stops horizontal and diagonal shifts from
+    wrapping onto the next row. The NumPy grid is still kept in sync so code
+    that reads ``board.board`` directly keeps working.
+    """
+
+    def __init__(self, size=19):
+        super().__init__(size)
+        self.stride = size + 1
+        # Shift amounts for horizontal, vertical and the two diagonals
+        self.shifts = (1, self.stride, self.stride + 1, self.stride - 1)
+        self.bits = {1: 0, -1: 0}
+        self.occupied = 0
+
+    def make_move(self, row, col):
+        player = self.current_player
+        if not super().make_move(row, col):
+            return False
+        bit = 1 << (row * self.stride + col)
+        self.bits[player] |= bit
+        self.occupied |= bit
+        return True
+
+    def is_valid_move(self, row, col):
+        return (0 <= row < self.size and
+                0 <= col < self.size and
+                not (self.occupied >> (row * self.stride + col)) & 1)
+
+    def check_win(self):
+        if self.last_move is None:
+            return False
+
+        stones = self.bits[self.move_history[-1][2]]
+
+        # Five in a row along a shift d leaves a bit set in
+        # b & b>>d & b>>2d & b>>3d & b>>4d, built with three ANDs
+        for d in self.shifts:
+            pairs = stones & (stones >> d)
+            fours = pairs & (pairs >> (2 * d))
+            if fours & (stones >> (4 * d)):
+                return True
+        return False
+
+    def get_valid_moves(self):
+        rows, cols = np.nonzero(self.board == 0)
+        return list(zip(rows.tolist(), cols.tolist()))
+
+    def copy(self):
+        new_board = super().copy()
+        new_board.bits = self.bits.copy()
+        new_board.occupied = self.occupied
+        return new_board
+
+    def undo_move(self):
+        """Undo the last move and clear its bit."""
+        if not self.move_history:
+            return False
+
+        row, col, player = self.move_history[-1]
+        super().undo_move()
+        mask = ~(1 << (row * self.stride + col))
+        self.bits[player] &= mask
+        self.occupied &= mask
+        return True
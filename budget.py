@@ -0,0 +1,108 @@
+"""
+Gomoku Search Budget Module
+
+A SearchBudget caps one search by minimax nodes, wall-clock seconds or
+both. Node budgets make the move independent of machine speed and load;
+the clock is only read every `check_every` nodes, so a time budget costs
+almost nothing per node either. A CancelToken lets another thread (or
+process) stop a search early; it is polled on the same schedule.
+"""
+
+import threading
+import time
+
+NO_LIMIT = float('inf')
+
+
+class SearchBudget:
+    def __init__(self, nodes=None, seconds=None, check_every=256):
+        self.nodes = nodes
+        self.seconds = seconds
+        self.check_every = check_every
+
+    def start(self, start_time=None, cancel=None):
+        """Return a BudgetClock for a search that started at `start_time` (default now).
+
+        The search also stops as soon as the optional CancelToken `cancel` is set.
+        """
+        return BudgetClock(self, time.time() if start_time is None else start_time, cancel)
+
+    def __repr__(self):
+        return f"SearchBudget(nodes={self.nodes}, seconds={self.seconds})"
+
+
+class CancelToken:
+    """Set by the caller to stop a search; the search polls it.
+
+    Wraps a threading.Event by default. Pass a multiprocessing Event to
+    reach searches running in worker processes.
+    """
+
+    def __init__(self, event=None):
+        self.event = event if event is not None else threading.Event()
+
+    def cancel(self):
+        self.event.set()
+
+    def reset(self):
+        self.event.clear()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+
+class BudgetClock:
+    """Tracks one search against its budget.
+
+    The search compares its node count with next_check at every node and
+    only calls exhausted() when it is reached: at the node limit, or after
+    the next `check_every` nodes when there is a time limit or a cancel
+    token.
+    """
+
+    def __init__(self, budget, start_time, cancel=None):
+        self.budget = budget
+        self.start_time = start_time
+        self.cancel = cancel
+        self.deadline = None if budget.seconds is None else start_time + budget.seconds
+        self.next_check = self._next_check(0)
+
+    def _next_check(self, nodes):
+        limit = NO_LIMIT if self.budget.nodes is None else self.budget.nodes + 1
+        if self.deadline is not None or self.cancel is not None:
+            limit = min(limit, nodes + self.budget.check_every)
+        return limit
+
+    @property
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.cancelled
+
+    def exhausted(self, nodes):
+        """True once cancelled, more than the node budget is spent or the deadline has passed."""
+        if self.cancelled:
+            return True
+        if self.budget.nodes is not None and nodes > self.budget.nodes:
+            return True
+        if self.deadline is not None and time.time() > self.deadline:
+            return True
+        self.next_check = self._next_check(nodes)
+        return False
+
+    def allows_iteration(self, nodes):
+        """Whether another deepening iteration is worth starting.
+
+        Not once cancelled or the node budget is spent, nor after 80% of the
+        time budget, since the next iteration would almost certainly be cut
+        short.
+        """
+        if self.cancelled:
+            return False
+        if self.budget.nodes is not None and nodes >= self.budget.nodes:
+            return False
+        if self.deadline is not None and time.time() - self.start_time > self.budget.seconds * 0.8:
+            return False
+        return True
+
+    def elapsed(self):
+        return time.time() - self.start_time
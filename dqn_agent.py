@@ -2,8 +2,8 @@ import torch
 import torch.nn as nn
 import torch.optim as optim
 import numpy as np
-from collections import deque
 import random
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer
 
 class DQN(nn.Module):
     def __init__(self, input_size):
@@ -20,11 +20,19 @@ class DQN(nn.Module):
         return self.fc3(x)
 
 class DQNAgent:
-    def __init__(self, state_size, action_size, device="cuda" if torch.cuda.is_available() else "cpu"):
+    def __init__(self, state_size, action_size, device="cuda" if torch.cuda.is_available() else "cpu",
+                 memory_size=100000, prioritized=False):
         self.state_size = state_size
         self.action_size = action_size
         self.device = device
-        self.memory = deque(maxlen=10000)
+        # Transitions are stored as int8 boards, about 370 bytes each on 19x19.
+        # Prioritized replay favours transitions with large TD errors, such
+        # as the rare wins and losses.
+        self.prioritized = prioritized
+        if prioritized:
+            self.memory = PrioritizedReplayBuffer(memory_size, (state_size, state_size))
+        else:
+            self.memory = ReplayBuffer(memory_size, (state_size, state_size))
         self.gamma = 0.95    # discount rate
         self.epsilon = 1.0   # exploration rate
         self.epsilon_min = 0.01
@@ -39,40 +47,51 @@ class DQNAgent:
         self.target_model.load_state_dict(self.model.state_dict())
 
     def remember(self, state, action, reward, next_state, done):
-        self.memory.append((state, action, reward, next_state, done))
+        self.memory.add(state, action, reward, next_state, done)
+
+    def act(self, state, action_mask):
+        """Pick an action for `state` among those set in the boolean `action_mask`.
+
+        The mask is the one GomokuEnv returns in info["action_mask"]; a list
+        of legal action indices is also accepted.
+        """
+        action_mask = np.asarray(action_mask)
+        if action_mask.dtype != bool:
+            valid_moves = action_mask
+            action_mask = np.zeros(self.action_size, dtype=bool)
+            action_mask[valid_moves] = True
 
-    def act(self, state, valid_moves):
         if random.random() <= self.epsilon:
-            return random.choice(valid_moves)
+            return int(random.choice(np.flatnonzero(action_mask)))
         
         state = torch.FloatTensor(state).unsqueeze(0).to(self.device)
         act_values = self.model(state)
         act_values = act_values.cpu().detach().numpy()[0]
         
         # Mask invalid moves with negative infinity
-        mask = np.ones_like(act_values) * float('-inf')
-        for move in valid_moves:
-            mask[move] = 0
-        act_values += mask
+        act_values[~action_mask] = float('-inf')
         
-        return np.argmax(act_values)
+        return int(np.argmax(act_values))
 
     def replay(self, batch_size):
         if len(self.memory) < batch_size:
             return
         
-        minibatch = random.sample(self.memory, batch_size)
-        states = torch.FloatTensor(np.array([x[0] for x in minibatch])).to(self.device)
-        actions = torch.LongTensor(np.array([x[1] for x in minibatch])).to(self.device)
-        rewards = torch.FloatTensor(np.array([x[2] for x in minibatch])).to(self.device)
-        next_states = torch.FloatTensor(np.array([x[3] for x in minibatch])).to(self.device)
-        dones = torch.FloatTensor(np.array([x[4] for x in minibatch])).to(self.device)
+        batch = self.memory.sample(batch_size)
+        states, actions, rewards, next_states, dones = (torch.from_numpy(array).to(self.device) for array in batch[:5])
 
         current_q_values = self.model(states).gather(1, actions.unsqueeze(1))
         next_q_values = self.target_model(next_states).max(1)[0].detach()
         target_q_values = rewards + (1 - dones) * self.gamma * next_q_values
 
-        loss = nn.MSELoss()(current_q_values.squeeze(), target_q_values)
+        if self.prioritized:
+            # Importance weights undo the bias of sampling by priority
+            weights, indices = batch[5:]
+            td_errors = current_q_values.squeeze(1) - target_q_values
+            loss = (torch.from_numpy(weights).to(self.device) * td_errors.pow(2)).mean()
+            self.memory.update_priorities(indices, td_errors.detach().cpu().numpy())
+        else:
+            loss = nn.MSELoss()(current_q_values.squeeze(), target_q_values)
         
         self.optimizer.zero_grad()
         loss.backward()
@@ -63,7 +63,7 @@ def evaluate(model_path):
     agent.epsilon = 0  # No exploration during evaluation
     
     gui = GomokuGUI()
-    state, _ = env.reset()
+    state, info = env.reset()
     done = False
     
     while not done:
@@ -79,13 +79,12 @@ def evaluate(model_path):
                 if cell and env.board.is_valid_move(*cell):
                     row, col = cell
                     action = row * env.size + col
-                    state, reward, done, _, _ = env.step(action)
+                    state, reward, done, _, info = env.step(action)
                     gui.draw_board(env.board.board)
         
         if not done and env.board.current_player == -1:
-            valid_moves = [i * env.size + j for i, j in env.board.get_valid_moves()]
-            action = agent.act(state, valid_moves)
-            state, reward, done, _, _ = env.step(action)
+            action = agent.act(state, info["action_mask"])
+            state, reward, done, _, info = env.step(action)
             gui.draw_board(env.board.board)
         
         if done:
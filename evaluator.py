@@ -0,0 +1,282 @@
+"""
+Gomoku Evaluation Module
+
+Vectorised static evaluation. Every row, column and diagonal is cut into
+overlapping six-cell windows, each window is encoded as a base-3 integer and
+the integer is looked up in a precomputed pattern table. Centre control and
+proximity are dot products against weight matrices built once per board size.
+"""
+
+import numpy as np
+
+# Pattern scores, on the same scale GomokuAI has always used
+FIVE = 100000
+OPEN_FOUR = 15000
+BLOCKED_FOUR = 4000
+OPEN_THREE = 3000
+BLOCKED_THREE = 1000
+OPEN_TWO = 500
+
+WIN_SCORE = 100000
+MATERIAL_WEIGHT = 10
+CENTER_WEIGHT = 50
+PROXIMITY_WEIGHT = 5
+
+WINDOW = 6
+# Cell codes from one player's point of view. Board edges count as blocked.
+EMPTY, OWN, BLOCKED = 0, 1, 2
+POWERS = 3 ** np.arange(WINDOW)
+# Column weights that turn (black view, white view) window scores into black's score
+SIDES = np.array([1, -1], dtype=np.int64)
+
+# Map board values (-1, 0, 1) + 1 to cell codes for each player
+VIEW = {
+    1: np.array([BLOCKED, EMPTY, OWN], dtype=np.int8),
+    -1: np.array([OWN, EMPTY, BLOCKED], dtype=np.int8),
+}
+
+# Code added to (black view, white view) when a stone of each colour is placed
+STONE_CODES = {
+    1: np.array([OWN, BLOCKED], dtype=np.int64),
+    -1: np.array([BLOCKED, OWN], dtype=np.int64),
+}
+
+
+def classify_window(cells):
+    """Score one window of cell codes for the player whose stones are OWN.
+
+    Recognises split shapes such as X.XX as well as contiguous runs.
+    """
+    text = ''.join('.XO'[cell] for cell in cells)
+    halves = (text[:5], text[1:])
+    inner = text[1:5]
+    open_ends = text[0] == '.' and text[5] == '.'
+
+    if 'XXXXX' in text:
+        return FIVE
+    if text == '.XXXX.':
+        return OPEN_FOUR
+    if any(part.count('X') == 4 and 'O' not in part for part in halves):
+        return BLOCKED_FOUR
+    if open_ends and inner.count('X') == 3 and 'O' not in inner:
+        return OPEN_THREE
+    if any(part.count('X') == 3 and 'O' not in part for part in halves):
+        return BLOCKED_THREE
+    if open_ends and inner.count('X') == 2 and 'O' not in inner:
+        return OPEN_TWO
+    return 0
+
+
+def build_pattern_table():
+    """Return an array mapping every base-3 window code to its pattern score."""
+    table = np.zeros(3 ** WINDOW, dtype=np.int64)
+    for code in range(3 ** WINDOW):
+        cells = [(code // 3 ** k) % 3 for k in range(WINDOW)]
+        table[code] = classify_window(cells)
+    return table
+
+
+PATTERN_TABLE = build_pattern_table()
+
+
+def line_windows(size):
+    """Return a (windows, 6) array of flat cell indices covering every line.
+
+    Each line of length five or more is padded with one wall cell at both
+    ends; the wall is index size * size in the flattened board.
+    """
+    wall = size * size
+    lines = []
+    for r in range(size):
+        lines.append([(r, c) for c in range(size)])
+    for c in range(size):
+        lines.append([(r, c) for r in range(size)])
+    for d in range(-(size - 1), size):
+        lines.append([(r, r - d) for r in range(size) if 0 <= r - d < size])
+        lines.append([(r, d + size - 1 - r) for r in range(size) if 0 <= d + size - 1 - r < size])
+
+    windows = []
+    for line in lines:
+        if len(line) < 5:
+            continue
+        padded = [wall] + [r * size + c for r, c in line] + [wall]
+        for start in range(len(padded) - WINDOW + 1):
+            windows.append(padded[start:start + WINDOW])
+    return np.array(windows, dtype=np.intp)
+
+
+class PatternEvaluator:
+    """Static evaluator for one board size. Scores are positive for black."""
+
+    def __init__(self, size):
+        self.size = size
+        self.windows = line_windows(size)
+
+        # Centre control: 50 * (1 - distance / (2 * center)) per stone,
+        # kept as an integer numerator over 2 * center
+        center = size // 2
+        rows, cols = np.indices((size, size))
+        distance = np.abs(rows - center) + np.abs(cols - center)
+        self.center_scale = 2 * center
+        self.center_weights = (self.center_scale - distance).ravel().astype(np.float64)
+
+        # adjacency[i, j] is 1 when cells i and j touch (including diagonally)
+        flat = size * size
+        self.adjacency = np.zeros((flat, flat), dtype=np.float64)
+        self.neighbours = []
+        for r in range(size):
+            for c in range(size):
+                cells = [(r + dr) * size + c + dc
+                         for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                         if (dr or dc) and 0 <= r + dr < size and 0 <= c + dc < size]
+                self.adjacency[r * size + c, cells] = 1
+                self.neighbours.append(np.array(cells, dtype=np.intp))
+
+        # For incremental updates: the windows through each cell and the
+        # power of 3 of the cell's slot in each. Cells on fewer windows are
+        # padded with a dummy window (index len(windows)) and power 0.
+        through = [[] for _ in range(flat)]
+        for w, window in enumerate(self.windows):
+            for slot, cell in enumerate(window):
+                if cell < flat:
+                    through[cell].append((w, POWERS[slot]))
+        width = max(len(entries) for entries in through)
+        self.cell_windows = np.full((flat, width), len(self.windows), dtype=np.intp)
+        self.cell_powers = np.zeros((flat, width, 1), dtype=np.int64)
+        for cell, entries in enumerate(through):
+            for k, (w, power) in enumerate(entries):
+                self.cell_windows[cell, k] = w
+                self.cell_powers[cell, k, 0] = power
+        # Change to each window's (black view, white view) codes when a stone is placed
+        self.cell_deltas = {player: self.cell_powers * STONE_CODES[player] for player in (1, -1)}
+        self.center_weight_list = [int(weight) for weight in self.center_weights]
+
+    def pattern_score(self, grid):
+        """Sum of black's window scores minus white's."""
+        score = 0
+        for player in (1, -1):
+            cells = np.append(VIEW[player][grid.ravel() + 1], BLOCKED)
+            codes = cells[self.windows] @ POWERS
+            score += player * int(PATTERN_TABLE[codes].sum())
+        return score
+
+    def evaluate(self, board):
+        """Score `board` from black's point of view."""
+        if board.check_win():
+            return WIN_SCORE * -board.current_player  # Opponent won
+
+        grid = board.board.ravel()
+        black = (grid == 1).astype(np.float64)
+        white = (grid == -1).astype(np.float64)
+
+        # Material advantage (small factor)
+        score = int(black.sum() - white.sum()) * MATERIAL_WEIGHT
+
+        score += self.pattern_score(board.board)
+
+        # Center control bonus, weighted by distance from the center
+        center = int((black - white) @ self.center_weights)
+        score += CENTER_WEIGHT * center // self.center_scale
+
+        # Proximity: empty cells next to the opponent of the side to move
+        opponent = white if board.current_player == 1 else black
+        empty = 1.0 - black - white
+        pairs = int(empty @ self.adjacency @ opponent)
+        score += board.current_player * PROXIMITY_WEIGHT * pairs
+        return score
+
+
+class IncrementalEvaluator:
+    """Running evaluation of one board, kept up to date move by move.
+
+    Attaching it sets ``board.evaluator``; Board.make_move and
+    Board.undo_move then report each stone and only the windows through that
+    stone (at most six per direction) are rescored. score() returns exactly
+    what PatternEvaluator.evaluate would for the same board.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.patterns = get_evaluator(board.size)
+        grid = board.board.ravel()
+
+        # codes[w] holds the window code from black's and white's view; the
+        # extra last row is the dummy window used for padding
+        codes = np.zeros((len(self.patterns.windows) + 1, 2), dtype=np.int64)
+        for k, player in enumerate((1, -1)):
+            cells = np.append(VIEW[player][grid + 1], BLOCKED)
+            codes[:-1, k] = cells[self.patterns.windows] @ POWERS
+        self.codes = codes
+        self.patterns_total = int(PATTERN_TABLE[codes].sum(axis=0) @ SIDES)
+
+        black = (grid == 1).astype(np.float64)
+        white = (grid == -1).astype(np.float64)
+        empty = 1.0 - black - white
+        self.material = int(black.sum() - white.sum())
+        self.center = int((black - white) @ self.patterns.center_weights)
+        # Number of (empty cell, stone) neighbour pairs for each colour
+        self.pairs = {
+            1: int(empty @ self.patterns.adjacency @ black),
+            -1: int(empty @ self.patterns.adjacency @ white),
+        }
+        board.evaluator = self
+
+    def _update(self, index, player, sign):
+        patterns = self.patterns
+        windows = patterns.cell_windows[index]
+
+        codes = self.codes[windows]
+        before = PATTERN_TABLE[codes]
+        codes += patterns.cell_deltas[player][index] if sign > 0 else -patterns.cell_deltas[player][index]
+        self.codes[windows] = codes
+        self.patterns_total += int(((PATTERN_TABLE[codes] - before) @ SIDES).sum())
+
+        self.material += sign * player
+        self.center += sign * player * patterns.center_weight_list[index]
+
+        # The cell's neighbours lose (or regain) it as an empty neighbour,
+        # and the cell itself gains (or loses) its empty neighbours
+        neighbours = self.board.board.ravel()[patterns.neighbours[index]]
+        white, empty, black = np.bincount(neighbours + 1, minlength=3).tolist()
+        self.pairs[1] -= sign * black
+        self.pairs[-1] -= sign * white
+        self.pairs[player] += sign * empty
+
+    def stone_placed(self, index, player):
+        self._update(index, player, 1)
+
+    def stone_removed(self, index, player):
+        self._update(index, player, -1)
+
+    def pattern_gains(self, indices, player):
+        """Change in the pattern total if `player` placed a stone on each empty cell.
+
+        Computed for all `indices` at once without touching the board; the
+        result is from black's point of view, like score().
+        """
+        patterns = self.patterns
+        windows = patterns.cell_windows[indices]
+        codes = self.codes[windows]
+        after = codes + patterns.cell_deltas[player][indices]
+        return ((PATTERN_TABLE[after] - PATTERN_TABLE[codes]) @ SIDES).sum(axis=1)
+
+    def score(self):
+        """Score the attached board from black's point of view in O(1)."""
+        board = self.board
+        if board.check_win():
+            return WIN_SCORE * -board.current_player  # Opponent won
+
+        score = self.material * MATERIAL_WEIGHT + self.patterns_total
+        score += CENTER_WEIGHT * self.center // self.patterns.center_scale
+        score += board.current_player * PROXIMITY_WEIGHT * self.pairs[-board.current_player]
+        return score
+
+
+_evaluators = {}
+
+
+def get_evaluator(size):
+    """Return the shared PatternEvaluator for a board size."""
+    if size not in _evaluators:
+        _evaluators[size] = PatternEvaluator(size)
+    return _evaluators[size]
@@ -1,12 +1,19 @@
 import gymnasium as gym
 import numpy as np
-from board import Board
+from board import BitBoard
 
 class GomokuEnv(gym.Env):
+    """Self-play Gomoku with rewards from black's point of view.
+
+    info["action_mask"] marks the empty cells. The mask and the count of
+    empty cells are updated as stones are placed, so each step does a
+    constant amount of legality and termination work.
+    """
+
     def __init__(self, size=19):
         super().__init__()
         self.size = size
-        self.board = Board(size)
+        self.board = BitBoard(size)
         
         # Define action and observation spaces
         self.action_space = gym.spaces.Discrete(size * size)
@@ -18,38 +25,149 @@ class GomokuEnv(gym.Env):
 
     def reset(self, seed=None):
         super().reset(seed=seed)
-        self.board = Board(self.size)
-        return self._get_observation(), {}
+        self.board = BitBoard(self.size)
+        self.action_mask = np.ones(self.size * self.size, dtype=bool)
+        self.empty_cells = self.size * self.size
+        return self._get_observation(), self._get_info()
 
     def step(self, action):
-        # Convert action to row, col
-        row = action // self.size
-        col = action % self.size
-        
-        # Make move
-        valid_move = self.board.make_move(row, col)
-        
+        # An action is legal if it is on the board and its cell is empty
+        valid_move = 0 <= action < self.action_mask.size and self.action_mask[action]
+        won = False
+        if valid_move:
+            self.board.make_move(action // self.size, action % self.size)
+            self.action_mask[action] = False
+            self.empty_cells -= 1
+            won = self.board.check_win()
+
         # Get observation
         observation = self._get_observation()
         
-        # Check if game is done
-        done = self.board.check_win() or len(self.board.get_valid_moves()) == 0
+        # The game ends with a five or a full board
+        done = won or self.empty_cells == 0
         
         # Calculate reward
         if not valid_move:
             reward = -10  # Penalty for invalid move
+        elif won:
+            reward = 100 if self.board.current_player == -1 else -100  # Win/Lose
         elif done:
-            if self.board.check_win():
-                reward = 100 if self.board.current_player == -1 else -100  # Win/Lose
-            else:
-                reward = 0  # Draw
+            reward = 0  # Draw
         else:
             reward = -0.1  # Small penalty for each move to encourage faster wins
         
-        return observation, reward, done, False, {}
+        return observation, reward, done, False, self._get_info()
+
+    def _get_info(self):
+        return {"action_mask": self.action_mask.copy()}
 
     def _get_observation(self):
         return self.board.board.astype(np.float32)
 
     def render(self):
-        print(self.board) 
\ No newline at end of file
+        print(self.board) 
+
+# Line directions and the four steps taken from a stone along each of them
+_DIRECTIONS = np.array([(0, 1), (1, 0), (1, 1), (1, -1)])
+_STEPS = np.arange(1, 5)
+_PAD = 4
+
+
+class GomokuVectorEnv(gym.vector.VectorEnv):
+    """N independent GomokuEnv games stepped together with NumPy.
+
+    All boards live in one (N, size, size) int8 array, padded by four empty
+    cells on every side so the line checks around the stone just played
+    never need bounds tests. Observations, rewards and termination follow
+    GomokuEnv, with one action mask per game in info["action_mask"];
+    finished games are reset automatically, with their last observation in
+    info["final_observation"] as in gymnasium's vector envs.
+    """
+
+    def __init__(self, num_envs, size=19):
+        self.size = size
+        single_observation_space = gym.spaces.Box(low=-1, high=1, shape=(size, size), dtype=np.float32)
+        super().__init__(num_envs, single_observation_space, gym.spaces.Discrete(size * size))
+        self._padded = np.zeros((num_envs, size + 2 * _PAD, size + 2 * _PAD), dtype=np.int8)
+        self.boards = self._padded[:, _PAD:-_PAD, _PAD:-_PAD]
+        # Flat offsets in the padded array of the four cells beyond a stone
+        # on each side of each direction, shape (2 sides, 4 directions, 4 steps)
+        width = size + 2 * _PAD
+        forward = (_DIRECTIONS[:, 0, None] * width + _DIRECTIONS[:, 1, None]) * _STEPS
+        self._line_offsets = np.stack([forward, -forward])
+        self.current_player = np.ones(num_envs, dtype=np.int8)
+        self.stones = np.zeros(num_envs, dtype=np.int32)
+        self._env_index = np.arange(num_envs)
+        self._actions = None
+
+    def reset_wait(self, seed=None, options=None):
+        if seed is not None:
+            self._np_random, seed = gym.utils.seeding.np_random(seed if isinstance(seed, int) else seed[0])
+        self._reset_games(np.ones(self.num_envs, dtype=bool))
+        return self._get_observation(), self._get_info()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions, dtype=np.int64)
+
+    def step_wait(self):
+        actions = self._actions
+        index = self._env_index
+        players = self.current_player.copy()
+        rows, cols = np.divmod(actions, self.size)
+
+        in_range = (actions >= 0) & (actions < self.size * self.size)
+        rows, cols = np.where(in_range, rows, 0), np.where(in_range, cols, 0)
+        valid = in_range & (self.boards[index, rows, cols] == 0)
+        self.boards[index[valid], rows[valid], cols[valid]] = players[valid]
+        self.stones += valid
+        self.current_player[valid] *= -1
+
+        won = valid & self._wins(rows, cols, players)
+        full = valid & (self.stones == self.size * self.size)
+        terminated = won | full
+
+        # Rewards are from black's point of view, as in GomokuEnv
+        rewards = np.where(valid, -0.1, -10.0)
+        rewards[full] = 0.0
+        rewards[won] = 100.0 * players[won]
+
+        observation = self._get_observation()
+        final_observation = None
+        if terminated.any():
+            final_observation = np.empty(self.num_envs, dtype=object)
+            for n in np.flatnonzero(terminated):
+                final_observation[n] = observation[n].copy()
+            self._reset_games(terminated)
+            observation[terminated] = 0.0
+        infos = self._get_info()
+        if final_observation is not None:
+            infos["final_observation"] = final_observation
+            infos["_final_observation"] = terminated.copy()
+        return observation, rewards, terminated, np.zeros(self.num_envs, dtype=bool), infos
+
+    def _wins(self, rows, cols, players):
+        """Whether the stone each game just played at (rows, cols) makes five or more."""
+        height, width = self._padded.shape[1:]
+        stones = (self._env_index * height + rows + _PAD) * width + cols + _PAD
+        cells = self._padded.ravel()[stones[:, None, None, None] + self._line_offsets]
+        # Length of the unbroken run on each side of the stone, per
+        # direction: the step of the first cell that is not the player's
+        same = np.zeros(cells.shape[:3] + (5,), dtype=bool)
+        same[..., :4] = cells == players[:, None, None, None]
+        runs = np.argmin(same, axis=3)
+        return (runs.sum(axis=1) >= 4).any(axis=1)
+
+    def _reset_games(self, mask):
+        self.boards[mask] = 0
+        self.current_player[mask] = 1
+        self.stones[mask] = 0
+
+    def _get_observation(self):
+        return self.boards.astype(np.float32)
+
+    def _get_info(self):
+        return {"action_mask": self.boards.reshape(self.num_envs, -1) == 0}
+
+    def render(self):
+        for board in self.boards:
+            print(board)
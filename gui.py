@@ -9,8 +9,9 @@ import sys
 import os
 import math
 import random
-from board import Board
+from board import BitBoard
 from ai import GomokuAI
+from ai_worker import AIWorker
 
 class GomokuGUI:
     def __init__(self, board_size=15, cell_size=40, margin=50):
@@ -40,9 +41,11 @@ class GomokuGUI:
         self.TEXT_COLOR = (50, 50, 50)  # Dark gray for text
         
         # Game state
-        self.board = Board()
+        self.board = BitBoard(self.board_size)
         self.difficulty = "medium"  # Default difficulty
         self.ai = GomokuAI(depth=3, difficulty=self.difficulty)
+        # The AI searches on a background thread so the window stays responsive
+        self.ai_worker = AIWorker(self.ai)
         self.game_over = False
         self.winner = None
         self.hover_pos = None
@@ -273,6 +276,7 @@ class GomokuGUI:
             if button_rect.collidepoint(pos):
                 self.difficulty = diff
                 self.ai = GomokuAI(depth=3, difficulty=diff)
+                self.ai_worker = AIWorker(self.ai)
                 return
         
         # Check if stone color buttons were clicked
@@ -284,22 +288,8 @@ class GomokuGUI:
         elif white_rect.collidepoint(pos):
             self.player_color = -1  # White
             self.showing_color_selection = False
-            # Add starting animation
+            # Add starting animation; the main loop starts the AI's first move
             self._add_starting_animation()
-            
-            # Draw board to show initial state
-            self.draw_board()
-            
-            # Make AI move first when player chooses white - show thinking status
-            status_rect = pygame.Rect(self.window_size[0] // 2 - 100, 10, 200, 30)
-            self._draw_status(status_rect, "AI thinking...", (200, 100, 50))
-            pygame.display.flip()
-            
-            # Get AI's move
-            ai_move = self.ai.get_best_move(self.board)
-            if ai_move:
-                self.board.make_move(*ai_move)
-                self._add_stone_animation(*ai_move, 1)  # Add stone animation for AI's move
     
     def _add_starting_animation(self):
         """Add a board reveal animation."""
@@ -474,6 +464,15 @@ class GomokuGUI:
             if self.board.current_player == self.player_color:
                 status_text = "Your turn"
                 self._draw_status(status_rect, status_text, (50, 50, 200))
+            elif self.ai_worker.thinking:
+                # Animated dots show the window is alive while the AI searches
+                dots = "." * (pygame.time.get_ticks() // 300 % 4)
+                self._draw_status(status_rect, f"AI thinking{dots:<3}", (200, 100, 50))
+                progress = self.ai_worker.progress
+                if progress is not None:
+                    depth_text = self.info_font.render(f"Depth {progress.depth}", True, self.TEXT_COLOR)
+                    depth_rect = depth_text.get_rect(midtop=(status_rect.centerx, status_rect.bottom + 2))
+                    self.screen.blit(depth_text, depth_rect)
             else:
                 # Only show "AI's turn" during AI's turn
                 status_text = "AI's turn"
@@ -529,7 +528,9 @@ class GomokuGUI:
         return None
     
     def reset_game(self):
-        self.board = Board()
+        # Abandon any search still running for the old game
+        self.ai_worker.cancel()
+        self.board = BitBoard(self.board_size)
         self.game_over = False
         self.winner = None
         self.hover_pos = None
@@ -537,11 +538,19 @@ class GomokuGUI:
         self.showing_color_selection = True  # Return to color selection screen
         # Preserve the chosen difficulty level
         self.ai = GomokuAI(depth=3, difficulty=self.difficulty)
+        self.ai_worker = AIWorker(self.ai)
     
     def undo_move(self):
         """Undo the last move and the AI's move before it."""
         if self.game_over:
             return
+
+        # While the AI is thinking, cancel it and take back the move it was answering
+        if self.ai_worker.thinking:
+            self.ai_worker.cancel()
+            if self.board.undo_move():
+                self.animation_stones = []
+            return
             
         # Only allow undo when it's the player's turn
         if self.board.current_player != self.player_color:
@@ -562,20 +571,18 @@ class GomokuGUI:
         white_rect = None
         diff_buttons = []
         
-        # For managing AI move timing
-        ai_move_needed = False
-        
         while True:
             clock.tick(60)  # Cap at 60 FPS for smooth animations
             
-            # Check if AI needs to make a move
-            if not self.showing_color_selection and not self.game_over and self.board.current_player != self.player_color and not ai_move_needed:
-                # Set flag to make AI move on next frame (after drawing "AI's turn")
-                ai_move_needed = True
+            # Start the AI's search in the background when it is its turn
+            if (not self.showing_color_selection and not self.game_over
+                    and self.board.current_player != self.player_color and not self.ai_worker.thinking):
+                self.ai_worker.start(self.board)
             
             # Process events
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    self.ai_worker.cancel()
                     pygame.quit()
                     sys.exit()
                 
@@ -597,11 +604,9 @@ class GomokuGUI:
                         # Check if restart button was clicked
                         if self.restart_button_rect.collidepoint(event.pos):
                             self.reset_game()
-                            ai_move_needed = False
                         elif self.game_over:
                             self.reset_game()
-                            ai_move_needed = False
-                        else:
+                        elif self.board.current_player == self.player_color:
                             pos = self.get_board_position(event.pos)
                             if pos and 0 <= pos[0] < self.board_size and 0 <= pos[1] < self.board_size:
                                 if self.board.make_move(*pos):
@@ -617,36 +622,24 @@ class GomokuGUI:
                             self.undo_move()  # Undo move on right click
             
             if not self.showing_color_selection:
+                # Play the AI's move once its background search has finished
+                result = self.ai_worker.poll()
+                if result is not None and result.move:
+                    ai_move = result.move
+                    self.board.make_move(*ai_move)
+                    # Add stone animation for AI's move
+                    self._add_stone_animation(*ai_move, self.board.board[ai_move[0]][ai_move[1]])
+                    
+                    if self.board.check_win():
+                        self.game_over = True
+                        # The winner is the AI
+                        self.winner = -self.player_color
+                
                 # Update animations
                 self._update_animations()
                 
                 # Draw the board
                 self.draw_board()
-                
-                # Handle AI move if needed (after board is drawn with "AI's turn" status)
-                if ai_move_needed:
-                    # Show thinking status
-                    status_rect = pygame.Rect(self.window_size[0] // 2 - 100, 10, 200, 30)
-                    self._draw_status(status_rect, "AI thinking...", (200, 100, 50))
-                    pygame.display.flip()
-                    
-                    # Make AI move
-                    ai_move = self.ai.get_best_move(self.board)
-                    if ai_move:
-                        self.board.make_move(*ai_move)
-                        # Add stone animation for AI's move
-                        self._add_stone_animation(*ai_move, self.board.board[ai_move[0]][ai_move[1]])
-                        
-                        if self.board.check_win():
-                            self.game_over = True
-                            # The winner is the AI
-                            self.winner = -self.player_color
-                    
-                    # Reset flag
-                    ai_move_needed = False
-
-            # Small delay for performance
-            pygame.time.delay(16)  # ~60 FPS
 
 if __name__ == "__main__":
     game = GomokuGUI()
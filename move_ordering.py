@@ -0,0 +1,97 @@
+"""
+Gomoku Move Ordering Module
+
+Ranks the candidate moves at a search node so alpha-beta sees the strongest
+ones first: the transposition-table move, then moves by a cheap local threat
+score (fours, open threes and the blocks against them), with killer moves
+and the history table breaking ties among quiet moves. The number of moves
+kept shrinks with ply, but forcing moves are never dropped.
+"""
+
+import numpy as np
+
+from evaluator import FIVE, OPEN_THREE
+
+TT_BONUS = 10 ** 9
+KILLER_BONUS = OPEN_THREE // 2
+HISTORY_CAP = OPEN_THREE // 4
+MAX_PLY = 64
+
+# Moves at or above this threat score are kept whatever the width
+FORCING = OPEN_THREE
+# Completing a five gains at least this much even after losing the four it replaces
+WINNING = FIVE // 2
+
+
+class MoveOrderer:
+    def __init__(self, size, max_width=24, min_width=8):
+        self.size = size
+        self.max_width = max_width
+        self.min_width = min_width
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = np.zeros(size * size, dtype=np.int64)
+
+    def new_search(self):
+        """Forget killers and age the history table before a new move is searched."""
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history //= 2
+
+    def threat_scores(self, board, moves):
+        """Return (attack, defence) arrays for `moves`.
+
+        Attack is what the move builds for the side to move; defence is what
+        the opponent would build on the same cell, i.e. what the move blocks.
+        """
+        evaluator = board.evaluator
+        if evaluator is None:
+            # Without an attached evaluator fall back to closeness to the centre
+            center = board.size // 2
+            closeness = np.array([-(abs(r - center) + abs(c - center)) for r, c in moves])
+            return closeness, np.zeros_like(closeness)
+
+        player = board.current_player
+        indices = np.array([r * board.size + c for r, c in moves], dtype=np.intp)
+        attack = evaluator.pattern_gains(indices, player) * player
+        defence = evaluator.pattern_gains(indices, -player) * -player
+        return attack, defence
+
+    def width(self, ply):
+        """How many moves to keep at `ply`, narrowing the deeper the node."""
+        return max(self.min_width, self.max_width - 4 * ply)
+
+    def order(self, board, moves, ply, tt_move=None):
+        """Return `moves` best first, truncated to the width for `ply`."""
+        attack, defence = self.threat_scores(board, moves)
+
+        # A move that wins, or the only ways to stop the opponent winning,
+        # make every other move irrelevant
+        for gains in (attack, defence):
+            if len(moves) and gains.max() >= WINNING:
+                return [move for move, gain in zip(moves, gains) if gain >= WINNING]
+
+        scores = attack + defence
+
+        killers = self.killers[min(ply, MAX_PLY - 1)]
+        ranked = []
+        for move, score in zip(moves, scores.tolist()):
+            priority = score
+            if move == tt_move:
+                priority += TT_BONUS
+            elif score < FORCING:
+                if move in killers:
+                    priority += KILLER_BONUS
+                priority += min(int(self.history[move[0] * self.size + move[1]]), HISTORY_CAP)
+            ranked.append((priority, score, move))
+        ranked.sort(key=lambda item: item[0], reverse=True)
+
+        width = self.width(ply)
+        return [move for i, (priority, score, move) in enumerate(ranked)
+                if i < width or score >= FORCING]
+
+    def record_cutoff(self, move, ply, depth):
+        """Remember a move that caused a beta cutoff."""
+        killers = self.killers[min(ply, MAX_PLY - 1)]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[move[0] * self.size + move[1]] += depth * depth
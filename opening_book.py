@@ -0,0 +1,199 @@
+"""
+Gomoku Opening Book Module
+
+Book moves keyed by canonical position key, so a line entered in one
+orientation also answers its rotations and mirror images. Moves are kept in
+the canonical frame and mapped back onto the board when looked up.
+
+Two books live here: a small one built in memory from a few hand-entered
+lines, and a binary book file written by an offline search (build_book)
+and read through a memory map (BookReader), so startup cost does not grow
+with the book.
+"""
+
+import argparse
+import mmap
+import struct
+import time
+
+import numpy as np
+
+from board import Board
+
+# Book file layout: a header, then the records as four parallel arrays
+# sorted by key (largest items first so every array is aligned):
+# keys uint64, scores int32, moves uint16 (canonical flat index), depths uint8
+BOOK_MAGIC = b"GMKB"
+BOOK_VERSION = 1
+BOOK_HEADER = struct.Struct("<4sHHI4x")  # magic, version, board size, record count
+
+# Opening lines as (row, col) offsets from the centre, black first: the
+# centre stone, a direct or diagonal reply, then black's third stone
+OPENING_LINES = [
+    [(0, 0), (-1, 0), (-1, 1)],
+    [(0, 0), (-1, 0), (-2, 1)],
+    [(0, 0), (-1, 0), (0, 1)],
+    [(0, 0), (-1, 0), (1, 1)],
+    [(0, 0), (-1, 1), (0, 1)],
+    [(0, 0), (-1, 1), (1, 1)],
+    [(0, 0), (-1, 1), (0, 2)],
+]
+
+
+class OpeningBook:
+    def __init__(self, size=15, lines=OPENING_LINES):
+        self.size = size
+        self.entries = {}  # Canonical key -> book moves in the canonical frame
+        center = size // 2
+        for line in lines:
+            self.add_line([(center + dr, center + dc) for dr, dc in line])
+
+    def add_line(self, moves):
+        """Enter every move of a line played from the empty board."""
+        board = Board(self.size)
+        for move in moves:
+            self.add(board, move)
+            board.make_move(*move)
+
+    def add(self, board, move):
+        """Enter `move` as a book reply to the position on `board`."""
+        replies = self.entries.setdefault(board.canonical_key, [])
+        move = board.to_canonical(move)
+        if move not in replies:
+            replies.append(move)
+
+    def lookup(self, board):
+        """Return the book moves for `board`, or an empty list.
+
+        When the position is itself symmetric, every equivalent image of a
+        book move is returned so none of them is favoured.
+        """
+        if board.size != self.size:
+            return []
+        replies = self.entries.get(board.canonical_key)
+        if not replies:
+            return []
+        moves = []
+        for transform in board.canonical_transforms():
+            for move in replies:
+                move = board.from_canonical(move, transform)
+                if move not in moves and board.is_valid_move(*move):
+                    moves.append(move)
+        return moves
+
+
+def write_book(path, size, entries):
+    """Write `entries` ({canonical key: (move index, score, depth)}) as a book file."""
+    keys = np.array(sorted(entries), dtype=np.uint64)
+    records = [entries[int(key)] for key in keys]
+    moves = np.array([move for move, _, _ in records], dtype=np.uint16)
+    scores = np.array([score for _, score, _ in records], dtype=np.int32)
+    depths = np.array([depth for _, _, depth in records], dtype=np.uint8)
+    with open(path, "wb") as f:
+        f.write(BOOK_HEADER.pack(BOOK_MAGIC, BOOK_VERSION, size, len(keys)))
+        for array in (keys, scores, moves, depths):
+            f.write(array.tobytes())
+
+
+class BookReader:
+    """Read-only view of a book file through a memory map.
+
+    Nothing but the header is read up front; each probe is a binary search
+    over the mapped keys, touching only the pages it needs.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, count = BOOK_HEADER.unpack_from(self.map)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {BOOK_VERSION} opening book")
+        self.path = path
+        self.size = size
+
+        offset = BOOK_HEADER.size
+        arrays = []
+        for dtype in (np.uint64, np.int32, np.uint16, np.uint8):
+            arrays.append(np.frombuffer(self.map, dtype=dtype, count=count, offset=offset))
+            offset += count * np.dtype(dtype).itemsize
+        self.keys, self.scores, self.moves, self.depths = arrays
+
+    def __len__(self):
+        return len(self.keys)
+
+    def probe(self, board):
+        """Return (move, score, depth) for `board`, or None if it is not in the book.
+
+        The score is from the point of view of the side to move.
+        """
+        if board.size != self.size or not len(self.keys):
+            return None
+        key = np.uint64(board.canonical_key)
+        i = int(np.searchsorted(self.keys, key))
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        move = board.from_canonical(divmod(int(self.moves[i]), self.size))
+        return move, int(self.scores[i]), int(self.depths[i])
+
+
+def build_book(path, size=15, plies=8, branching=2, depth=6, time_limit=10.0, nodes=None):
+    """Search every position within `plies` moves of the start and write a book file.
+
+    Each position is searched by iterative deepening up to `depth`, within
+    `time_limit` seconds and `nodes` nodes (None for no limit). Its children
+    are the best move found plus the next `branching - 1` moves in the root
+    ordering, so the book also covers likely deviations. Positions reached
+    in several ways or in several orientations are searched once.
+    """
+    from ai import GomokuAI
+    from budget import SearchBudget
+
+    ai = GomokuAI(difficulty="hard", budget=SearchBudget(nodes=nodes, seconds=time_limit))
+    ai.depth = depth
+    entries = {}
+    frontier = [[]]
+    for ply in range(plies):
+        next_frontier = []
+        for line in frontier:
+            board = Board(size)
+            for move in line:
+                board.make_move(*move)
+            key = board.canonical_key
+            if key in entries:
+                continue
+
+            start = time.time()
+            board = ai.new_search(board, start)
+            moves = ai.orderer.order(board, ai._candidate_moves(board), 0)
+            best_move = ai.iterative_deepening(board, moves)
+            row, col = board.to_canonical(best_move)
+            entries[key] = (row * size + col, ai.best_score or 0, ai.completed_depth)
+            print(f"ply {ply}  {len(entries):5d} positions  best {best_move} "
+                  f"score {ai.best_score} depth {ai.completed_depth} ({time.time() - start:.1f}s)")
+
+            children = [best_move] + [move for move in moves if move != best_move][:branching - 1]
+            for move in children:
+                board.make_move(*move)
+                if not board.check_win():
+                    next_frontier.append(line + [move])
+                board.undo_move()
+        frontier = next_frontier
+
+    write_book(path, size, entries)
+    return len(entries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build an opening book file by offline search.")
+    parser.add_argument("path", help="book file to write")
+    parser.add_argument("--size", type=int, default=15)
+    parser.add_argument("--plies", type=int, default=8, help="moves from the start to cover")
+    parser.add_argument("--branching", type=int, default=2, help="moves expanded per position")
+    parser.add_argument("--depth", type=int, default=6, help="maximum search depth")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="seconds per position")
+    parser.add_argument("--nodes", type=int, help="node budget per position (default: none)")
+    args = parser.parse_args()
+    count = build_book(args.path, args.size, args.plies, args.branching, args.depth, args.time_limit,
+                       args.nodes)
+    print(f"Wrote {count} positions to {args.path}")
@@ -0,0 +1,125 @@
+"""
+Gomoku Parallel Search Module
+
+Splits the root moves of a search across a pool of worker processes. Each
+worker runs its own iterative deepening over its share of the moves, with a
+transposition table it keeps between calls (or one file-backed table they
+all share), within the search budget or until the caller cancels. The
+results are merged at the deepest iteration every worker completed, so the
+scores compared were all searched to the same depth.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from budget import CancelToken
+
+# Seconds between checks of the caller's cancel token while workers search
+CANCEL_POLL = 0.01
+
+# The GomokuAI owned by each worker process, created by _init_worker, and
+# the token through which the parent cancels its searches
+_worker_ai = None
+_worker_cancel = None
+
+
+def _init_worker(difficulty, tt_size_mb, tt_path, cancel_event):
+    global _worker_ai, _worker_cancel
+    from ai import GomokuAI
+    _worker_ai = GomokuAI(difficulty=difficulty, tt_size_mb=tt_size_mb, tt_path=tt_path)
+    _worker_cancel = CancelToken(cancel_event)
+
+
+def _search_share(board_class, size, history, moves, depth, budget, start_time):
+    """Iteratively deepen over `moves` in the position reached by `history`.
+
+    Returns the (depth, score, move) of every completed iteration and the
+    search counters.
+    """
+    board = board_class(size)
+    for row, col, _ in history:
+        board.make_move(row, col)
+
+    ai = _worker_ai
+    ai.depth = depth
+    ai.budget = budget
+    board = ai.new_search(board, start_time, _worker_cancel)
+    ai.iterative_deepening(board, moves)
+    return ai.iterations, {
+        "nodes": ai.nodes,
+        "leaf_evaluations": ai.leaf_evaluations,
+        "cutoffs": ai.cutoffs,
+        "first_move_cutoffs": ai.first_move_cutoffs,
+        "tt_hits": ai.tt.hits - ai._tt_counts[0],
+        "tt_misses": ai.tt.misses - ai._tt_counts[1],
+    }
+
+
+def merge_results(moves, results):
+    """Pick the best move from per-share results; return (move, score, depth).
+
+    Only the deepest depth completed by every share that finished at least
+    one iteration is compared. Equal scores go to the move that comes first
+    in `moves`, so the choice does not depend on which worker ran it.
+    """
+    finished = [iterations for iterations, _ in results if iterations]
+    if not finished:
+        return moves[0], None, 0
+
+    depth = min(iterations[-1][0] for iterations in finished)
+    rank = {move: i for i, move in enumerate(moves)}
+    candidates = []
+    for iterations in finished:
+        _, score, move = next(entry for entry in iterations if entry[0] == depth)
+        candidates.append((-score, rank[move], move))
+    score, _, move = min(candidates)
+    return move, -score, depth
+
+
+class ParallelRootSearch:
+    def __init__(self, workers, difficulty="medium", tt_size_mb=16, tt_path=None):
+        self.workers = workers
+        self.difficulty = difficulty
+        self.tt_size_mb = tt_size_mb
+        self.tt_path = tt_path
+        self.pool = None  # Started on first use
+        self.cancel_event = multiprocessing.Event()  # Set to stop the workers' searches
+        self.counters = {}  # Search counters summed over the workers
+
+    def _get_pool(self):
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(self.difficulty, self.tt_size_mb, self.tt_path,
+                                                      self.cancel_event))
+        return self.pool
+
+    def search(self, board, moves, depth, budget, start_time, cancel=None):
+        """Search `moves` (best first) to at most `depth` plies within `budget`.
+
+        Moves are dealt round-robin so every worker gets a share of the
+        most promising ones, and each worker spends the whole budget on its
+        share; a time budget runs from `start_time`. Setting the CancelToken
+        `cancel` stops every worker. Returns (move, score, completed depth).
+        """
+        pool = self._get_pool()
+        self.cancel_event.clear()
+        shares = [moves[i::self.workers] for i in range(self.workers)]
+        history = list(board.move_history)
+        futures = [pool.submit(_search_share, type(board), board.size, history, share, depth, budget, start_time)
+                   for share in shares if share]
+        # Workers stop at their budget themselves, so this wait is bounded;
+        # a cancel is passed on to them through the shared event
+        pending = futures
+        while pending:
+            _, pending = wait(pending, timeout=CANCEL_POLL if cancel is not None else None)
+            if cancel is not None and cancel.cancelled:
+                self.cancel_event.set()
+                cancel = None
+        results = [future.result() for future in futures]
+        self.counters = {name: sum(counters[name] for _, counters in results) for name in results[0][1]}
+        return merge_results(moves, results)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
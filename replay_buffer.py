@@ -0,0 +1,169 @@
+"""
+Gomoku Replay Buffer Module
+
+ReplayBuffer keeps DQN transitions in preallocated ring arrays. Board
+states are stored once, as int8. The next state of a transition is the
+state of the one added after it, so it is read by index. Next states that
+cannot be found that way are kept on the side: the newest transition's,
+or where an episode was cut off without a terminal step. Terminal
+transitions need no next state, since their targets do not bootstrap.
+Sampling is vectorised and returns arrays ready to wrap as tensors.
+
+PrioritizedReplayBuffer samples in proportion to TD-error priorities kept
+in a SumTree, and returns importance-sampling weights for the loss.
+"""
+
+import numpy as np
+
+
+class ReplayBuffer:
+    def __init__(self, capacity, state_shape, seed=None):
+        self.capacity = capacity
+        self.states = np.zeros((capacity,) + tuple(state_shape), dtype=np.int8)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        # Next states not held by the following slot, by slot
+        self.next_states = {}
+        self.position = 0  # Slot the next transition is written to
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    def add(self, state, action, reward, next_state, done):
+        i = self.position
+        previous = (i - 1) % self.capacity
+        # The previous transition's next state is this state, now in slot i
+        if self.size and previous in self.next_states and np.array_equal(self.next_states[previous], state):
+            del self.next_states[previous]
+
+        self.next_states.pop(i, None)  # Drop what the overwritten transition kept
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.dones[i] = done
+        if not done:
+            self.next_states[i] = np.asarray(next_state, dtype=np.int8)
+
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size):
+        """Draw `batch_size` transitions uniformly, with replacement.
+
+        Returns float32 states, int64 actions, float32 rewards, float32 next
+        states and float32 done flags. Terminal transitions have all-zero
+        next states.
+        """
+        return self._gather(self.rng.integers(0, self.size, batch_size))
+
+    def _gather(self, indices):
+        next_states = self.states[(indices + 1) % self.capacity].astype(np.float32)
+        next_states[self.dones[indices]] = 0.0
+        if self.next_states:
+            for row in np.flatnonzero(np.isin(indices, np.fromiter(self.next_states, dtype=np.int64))):
+                next_states[row] = self.next_states[indices[row]]
+        return (
+            self.states[indices].astype(np.float32),
+            self.actions[indices],
+            self.rewards[indices],
+            next_states,
+            self.dones[indices].astype(np.float32),
+        )
+
+    def nbytes(self):
+        """Bytes held by the ring arrays and side-stored next states."""
+        arrays = self.states.nbytes + self.actions.nbytes + self.rewards.nbytes + self.dones.nbytes
+        return arrays + sum(state.nbytes for state in self.next_states.values())
+
+
+class SumTree:
+    """Array-based binary tree of priorities whose nodes hold the sums of their children.
+
+    Leaves are padded to a power of two; node i has children 2i and 2i + 1
+    and the root, node 1, holds the total. Updates and proportional
+    lookups work on whole batches, one NumPy operation per tree level.
+    """
+
+    def __init__(self, capacity):
+        self.leaves = 1
+        while self.leaves < capacity:
+            self.leaves *= 2
+        self.depth = self.leaves.bit_length() - 1
+        self.nodes = np.zeros(2 * self.leaves, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.nodes[1]
+
+    def __getitem__(self, indices):
+        return self.nodes[self.leaves + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        leaves = self.leaves + np.asarray(indices)
+        # With repeated indices the last priority wins, as with sequential updates
+        self.nodes[leaves] = priorities
+        # Repeated parents are just recomputed to the same sum
+        nodes = leaves
+        for _ in range(self.depth):
+            nodes = nodes // 2
+            self.nodes[nodes] = self.nodes[2 * nodes] + self.nodes[2 * nodes + 1]
+
+    def find(self, values):
+        """Leaf index for each value in [0, total): the first whose cumulative sum exceeds it."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.nodes[2 * nodes]
+            right = values >= left
+            values -= left * right
+            nodes = 2 * nodes + right
+        return nodes - self.leaves
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """ReplayBuffer sampling transitions in proportion to priority ** alpha.
+
+    New transitions get the largest priority seen so far, so each is
+    replayed at least once; update_priorities() then sets them from TD
+    errors. Samples carry importance-sampling weights, normalised to at
+    most 1, whose exponent beta rises from `beta` to 1 over `beta_steps`
+    samples to remove the bias by the end of training.
+    """
+
+    def __init__(self, capacity, state_shape, alpha=0.6, beta=0.4, beta_steps=100000, epsilon=1e-6, seed=None):
+        super().__init__(capacity, state_shape, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.beta_increment = (1.0 - beta) / beta_steps
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    def add(self, state, action, reward, next_state, done):
+        index = self.position
+        super().add(state, action, reward, next_state, done)
+        self.tree.update([index], [self.max_priority])
+
+    def sample(self, batch_size):
+        """Draw `batch_size` transitions, one from each equal slice of the total priority.
+
+        Returns the ReplayBuffer arrays followed by float32 importance
+        weights and the sampled indices, for update_priorities().
+        """
+        total = self.tree.total
+        values = (np.arange(batch_size) + self.rng.random(batch_size)) * (total / batch_size)
+        indices = np.minimum(self.tree.find(np.minimum(values, np.nextafter(total, 0))), self.size - 1)
+
+        probabilities = self.tree[indices] / total
+        weights = (self.size * probabilities) ** -self.beta
+        weights /= weights.max()
+        self.beta = min(1.0, self.beta + self.beta_increment)
+        return self._gather(indices) + (weights.astype(np.float32), indices)
+
+    def update_priorities(self, indices, td_errors):
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.tree.update(indices, priorities)
+        self.max_priority = max(self.max_priority, priorities.max())
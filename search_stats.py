@@ -0,0 +1,135 @@
+"""
+Gomoku Search Statistics Module
+
+SearchStats records what one get_best_move call did: where the move came
+from, node and leaf counts, cutoffs, transposition-table hits, the depth
+reached and the time spent per iteration and per phase. StatsLogger appends
+each record as one JSON line, and summarize() (or running this module on
+the file) aggregates runs over many games.
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+
+class SearchStats:
+    def __init__(self):
+        self.source = None  # "book", "opening", "random", "threat", "threat_space" or "search"
+        self.move = None
+        self.score = None
+        self.stones = 0
+        self.nodes = 0
+        self.threat_space_nodes = 0  # Nodes of the VCF/VCT search run before minimax
+        self.leaf_evaluations = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.tt_hits = 0
+        self.tt_misses = 0
+        self.completed_depth = 0
+        self.timed_out = False
+        self.cancelled = False  # Stopped by the caller's CancelToken
+        self.iterations = []  # One dict per completed iteration
+        self.phases = {}  # Seconds spent in each phase of get_best_move
+        self.seconds = 0.0
+
+    @contextmanager
+    def phase(self, name):
+        """Add the time spent in the with-block to phase `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    @property
+    def tt_hit_rate(self):
+        probes = self.tt_hits + self.tt_misses
+        return self.tt_hits / probes if probes else None
+
+    @property
+    def nodes_per_second(self):
+        search = self.phases.get("search")
+        return self.nodes / search if search else None
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "move": list(self.move) if self.move is not None else None,
+            "score": self.score,
+            "stones": self.stones,
+            "nodes": self.nodes,
+            "threat_space_nodes": self.threat_space_nodes,
+            "leaf_evaluations": self.leaf_evaluations,
+            "nodes_per_second": self.nodes_per_second,
+            "beta_cutoffs": self.beta_cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "tt_hits": self.tt_hits,
+            "tt_misses": self.tt_misses,
+            "tt_hit_rate": self.tt_hit_rate,
+            "completed_depth": self.completed_depth,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "iterations": self.iterations,
+            "phases": self.phases,
+            "seconds": self.seconds,
+        }
+
+
+class StatsLogger:
+    """Appends one JSON line per SearchStats to a file, opened on first use."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def log(self, stats, **extra):
+        if self.file is None:
+            self.file = open(self.path, "a", buffering=1)  # Line buffered
+        record = stats.to_dict()
+        record.update(extra)
+        self.file.write(json.dumps(record) + "\n")
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def summarize(path):
+    """Aggregate a JSON-lines stats file into per-source counts, depths and phase totals."""
+    moves = 0
+    sources, depths, phases = {}, {}, {}
+    nodes = search_seconds = timed_out = threat_space_nodes = 0
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            moves += 1
+            sources[record["source"]] = sources.get(record["source"], 0) + 1
+            threat_space_nodes += record.get("threat_space_nodes", 0)
+            for name, seconds in record["phases"].items():
+                phases[name] = phases.get(name, 0.0) + seconds
+            if record["source"] == "search":
+                depth = record["completed_depth"]
+                depths[depth] = depths.get(depth, 0) + 1
+                nodes += record["nodes"]
+                search_seconds += record["phases"].get("search", 0.0)
+                timed_out += record["timed_out"]
+    return {
+        "moves": moves,
+        "sources": sources,
+        "completed_depths": dict(sorted(depths.items())),
+        "nodes_per_second": nodes / search_seconds if search_seconds else None,
+        "timed_out": timed_out,
+        "threat_space_nodes": threat_space_nodes,
+        "phase_seconds": phases,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python search_stats.py <stats.jsonl>")
+        sys.exit(1)
+    for name, value in summarize(sys.argv[1]).items():
+        print(f"{name:>16}: {value}")
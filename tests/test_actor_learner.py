@@ -0,0 +1,25 @@
+"""train_actor_learner counters, including a run that receives no episodes."""
+
+from actor_learner import train_actor_learner
+
+
+def test_no_episodes_gives_zero_counters():
+    _, stats = train_actor_learner(1, episodes=0, size=9, save_every=None)
+    assert stats == {
+        "actors": 1,
+        "episodes": 0,
+        "env_steps": 0,
+        "updates": 0,
+        "seconds": 0.0,
+        "episodes_per_hour": 0.0,
+        "steps_per_second": 0.0,
+        "updates_per_second": 0.0,
+    }
+
+
+def test_counts_received_episodes():
+    _, stats = train_actor_learner(1, episodes=3, batch_size=8, size=9, save_every=None)
+    assert stats["episodes"] == 3
+    assert stats["env_steps"] >= 3 * 9
+    assert stats["seconds"] > 0
+    assert stats["steps_per_second"] > 0
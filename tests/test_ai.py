@@ -0,0 +1,19 @@
+"""GomokuAI resource handling and search budgets."""
+
+import os
+
+from ai import GomokuAI
+
+
+def test_close_closes_shared_table(tmp_path):
+    path = os.path.join(tmp_path, "tt.bin")
+    ai = GomokuAI(difficulty="easy", book_path=None, tt_path=path, tt_size_mb=1)
+    ai.close()
+    assert ai.tt.map.closed
+    # The file can be reopened straight away, as by a new session
+    again = GomokuAI(difficulty="easy", book_path=None, tt_path=path, tt_size_mb=1)
+    again.close()
+
+
+def test_close_with_in_memory_table():
+    GomokuAI(difficulty="easy", book_path=None).close()
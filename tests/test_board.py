@@ -0,0 +1,94 @@
+"""Board and BitBoard copies, and the symmetry-canonical keys and moves."""
+
+import random
+
+import pytest
+
+from board import BitBoard, Board, symmetry_table
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_copy_keeps_class_and_state(board_class):
+    board = board_class(15)
+    for move in [(7, 7), (7, 8), (8, 8), (6, 6), (9, 9)]:
+        board.make_move(*move)
+    copy = board.copy()
+
+    assert type(copy) is board_class
+    assert (copy.board == board.board).all()
+    assert copy.move_history == board.move_history
+    assert copy.hash_key == board.hash_key
+    assert copy.frontier == board.frontier
+    assert copy.get_candidate_moves() == board.get_candidate_moves()
+    if board_class is BitBoard:
+        assert copy.bits == board.bits
+        assert copy.occupied == board.occupied
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_copy_is_independent(board_class):
+    board = board_class(15)
+    for move in [(7, 7), (7, 8), (8, 8), (6, 8)]:
+        board.make_move(*move)
+    copy = board.copy()
+    for move in [(9, 9), (5, 8), (10, 10), (4, 8), (11, 11)]:
+        copy.make_move(*move)
+
+    assert copy.check_win()
+    assert not board.check_win()
+    assert len(board.move_history) == 4
+    assert board.is_valid_move(11, 11)
+    copy.undo_move()
+    assert not copy.check_win()
+
+
+def transformed(move, transform, size):
+    forward, _ = symmetry_table(size)
+    return divmod(forward[transform][move[0] * size + move[1]], size)
+
+
+@pytest.mark.parametrize("size", [9, 15])
+def test_canonical_move_round_trip(size):
+    board = Board(size)
+    for transform in range(8):
+        for row in range(size):
+            for col in range(size):
+                move = board.to_canonical((row, col), transform)
+                assert board.from_canonical(move, transform) == (row, col)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_symmetric_positions_share_canonical_key(board_class):
+    rng = random.Random(1)
+    size = 15
+    moves = []
+    while len(moves) < 12:
+        move = (rng.randrange(size), rng.randrange(size))
+        if move not in moves:
+            moves.append(move)
+
+    original = board_class(size)
+    for move in moves:
+        original.make_move(*move)
+    for transform in range(8):
+        image = board_class(size)
+        for move in moves:
+            image.make_move(*transformed(move, transform, size))
+        # Hash t of a position is the plain hash of its image under transform t
+        assert image.hash_key == original._hashes[transform]
+        assert image.canonical_key == original.canonical_key
+        # A move maps to the same canonical move from either board
+        for move in [(0, 0), (3, 11), (7, 7), (14, 2)]:
+            assert image.to_canonical(transformed(move, transform, size)) == original.to_canonical(move)
+
+
+def test_symmetric_position_has_several_canonical_transforms():
+    board = Board(15)
+    board.make_move(7, 7)
+    # A lone centre stone is invariant under all 8 symmetries
+    assert board.canonical_transforms() == list(range(8))
+    board.make_move(7, 8)
+    assert len(board.canonical_transforms()) == 2
+    board.undo_move()
+    board.undo_move()
+    assert board.canonical_key == Board(15).canonical_key
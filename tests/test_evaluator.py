@@ -0,0 +1,39 @@
+"""IncrementalEvaluator must always agree with a full PatternEvaluator rescore."""
+
+import random
+
+import pytest
+
+from board import BitBoard, Board
+from evaluator import IncrementalEvaluator, get_evaluator
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+@pytest.mark.parametrize("size", [9, 15, 19])
+def test_incremental_matches_full_evaluation(board_class, size):
+    rng = random.Random(size)
+    evaluator = get_evaluator(size)
+    center = size // 2
+    reach = min(6, center)
+    for _ in range(10):
+        board = board_class(size)
+        incremental = IncrementalEvaluator(board)
+        assert incremental.score() == evaluator.evaluate(board)
+        for _ in range(rng.randint(20, 120)):
+            board.make_move(center + rng.randint(-reach, reach), center + rng.randint(-reach, reach))
+            if rng.random() < 0.25:
+                board.undo_move()
+            assert incremental.score() == evaluator.evaluate(board), str(board)
+
+
+@pytest.mark.parametrize("board_class", [Board, BitBoard])
+def test_incremental_returns_to_start_after_undoing_everything(board_class):
+    rng = random.Random(0)
+    board = board_class(15)
+    incremental = IncrementalEvaluator(board)
+    empty_score = incremental.score()
+    while len(board.move_history) < 40 and not board.check_win():
+        board.make_move(rng.randrange(15), rng.randrange(15))
+    while board.undo_move():
+        assert incremental.score() == get_evaluator(15).evaluate(board)
+    assert incremental.score() == empty_score
@@ -0,0 +1,54 @@
+"""GomokuVectorEnv must play exactly like N separate GomokuEnv games."""
+
+import numpy as np
+import pytest
+
+from gomoku_env import GomokuEnv, GomokuVectorEnv
+
+
+def random_actions(rng, masks, size):
+    """Mostly legal moves, with occupied cells and off-board actions mixed in."""
+    actions = []
+    for mask in masks:
+        roll = rng.random()
+        if roll < 0.05:
+            actions.append(int(rng.choice([-1, size * size, size * size + 7])))
+        elif roll < 0.15:
+            actions.append(int(rng.integers(0, size * size)))
+        else:
+            actions.append(int(rng.choice(np.flatnonzero(mask))))
+    return actions
+
+
+@pytest.mark.parametrize("size", [5, 9, 15])
+def test_vector_env_matches_single_envs(size, num_envs=6, steps=400):
+    rng = np.random.default_rng(size)
+    vector = GomokuVectorEnv(num_envs, size)
+    singles = [GomokuEnv(size) for _ in range(num_envs)]
+    observations, infos = vector.reset(seed=0)
+    for n, env in enumerate(singles):
+        observation, info = env.reset()
+        np.testing.assert_array_equal(observations[n], observation)
+        np.testing.assert_array_equal(infos["action_mask"][n], info["action_mask"])
+
+    finished = 0
+    for _ in range(steps):
+        actions = random_actions(rng, infos["action_mask"], size)
+        observations, rewards, terminated, truncated, infos = vector.step(actions)
+        assert observations.dtype == np.float32
+        assert not truncated.any()
+        for n, env in enumerate(singles):
+            observation, reward, done, _, info = env.step(actions[n])
+            assert rewards[n] == pytest.approx(reward)
+            assert terminated[n] == done
+            if done:
+                finished += 1
+                assert infos["_final_observation"][n]
+                np.testing.assert_array_equal(infos["final_observation"][n], observation)
+                observation, info = env.reset()
+            elif "_final_observation" in infos:
+                assert not infos["_final_observation"][n]
+            np.testing.assert_array_equal(observations[n], observation)
+            np.testing.assert_array_equal(infos["action_mask"][n], info["action_mask"])
+    # The comparison must have covered finished games, not just openings
+    assert finished > 0
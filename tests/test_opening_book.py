@@ -0,0 +1,100 @@
+"""Opening books: the in-memory line book and book files read through BookReader."""
+
+import os
+
+import pytest
+
+from ai import BOOK_PATH
+from board import Board, symmetry_table
+from opening_book import BookReader, OpeningBook, write_book
+
+
+# A position with no symmetry, so each orientation has exactly one book move
+LINE = [(7, 7), (5, 8)]
+
+
+def transformed(move, transform, size):
+    forward, _ = symmetry_table(size)
+    return divmod(forward[transform][move[0] * size + move[1]], size)
+
+
+def play(size, moves):
+    board = Board(size)
+    for move in moves:
+        board.make_move(*move)
+    return board
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    """A book answering the empty board with the centre, and LINE with (6, 6)."""
+    path = os.path.join(tmp_path, "book.bin")
+    line = play(15, LINE)
+    row, col = line.to_canonical((6, 6))
+    entries = {
+        Board(15).canonical_key: (7 * 15 + 7, 12, 6),
+        line.canonical_key: (row * 15 + col, -340, 5),
+    }
+    write_book(path, 15, entries)
+    return path
+
+
+def test_reader_finds_every_orientation(book_path):
+    book = BookReader(book_path)
+    assert len(book) == 2
+    assert book.probe(Board(15)) == ((7, 7), 12, 6)
+    for transform in range(8):
+        board = play(15, [transformed(move, transform, 15) for move in LINE])
+        move, score, depth = book.probe(board)
+        assert move == transformed((6, 6), transform, 15)
+        assert (score, depth) == (-340, 5)
+
+
+def test_reader_misses(book_path):
+    book = BookReader(book_path)
+    assert book.probe(play(15, [(7, 7)])) is None
+    assert book.probe(Board(19)) is None
+
+
+def test_empty_book(tmp_path):
+    path = os.path.join(tmp_path, "empty.bin")
+    write_book(path, 15, {})
+    book = BookReader(path)
+    assert len(book) == 0
+    assert book.probe(Board(15)) is None
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = os.path.join(tmp_path, "not_a_book.bin")
+    with open(path, "wb") as f:
+        f.write(b"x" * 64)
+    with pytest.raises(ValueError):
+        BookReader(path)
+
+
+@pytest.mark.skipif(not os.path.exists(BOOK_PATH), reason="no opening book file built")
+def test_shipped_book_answers_the_opening():
+    book = BookReader(BOOK_PATH)
+    assert book.size == 15
+    move, _, depth = book.probe(Board(15))
+    assert Board(15).is_valid_move(*move)
+    assert depth > 0
+    # The reply to the first book move is in the book in every orientation
+    assert all(book.probe(play(15, [transformed(move, t, 15)])) is not None for t in range(8))
+
+
+def test_line_book_answers_rotated_lines():
+    book = OpeningBook(15)
+    assert book.lookup(Board(15)) == [(7, 7)]
+    # The first line's reply (6, 7) to the centre stone, seen from each orientation
+    for transform in range(8):
+        board = play(15, [(7, 7), transformed((6, 7), transform, 15)])
+        replies = book.lookup(board)
+        assert transformed((6, 8), transform, 15) in replies
+        assert all(board.is_valid_move(*move) for move in replies)
+
+
+def test_line_book_lists_every_image_in_symmetric_positions():
+    replies = OpeningBook(15).lookup(play(15, [(7, 7)]))
+    # Direct and diagonal replies, each in all four orientations
+    assert sorted(replies) == sorted({transformed(move, t, 15) for move in [(6, 7), (6, 8)] for t in range(8)})
@@ -0,0 +1,163 @@
+"""ReplayBuffer ring storage, checked against a plain list of transitions, and prioritized replay."""
+
+import numpy as np
+import pytest
+
+from gomoku_env import GomokuEnv
+from replay_buffer import PrioritizedReplayBuffer, ReplayBuffer, SumTree
+
+
+def transitions(count, size=5, seed=0, cut_every=7):
+    """`count` random self-play transitions; every `cut_every`-th episode is cut off unfinished."""
+    rng = np.random.default_rng(seed)
+    env = GomokuEnv(size)
+    state, info = env.reset()
+    episode = step = 0
+    result = []
+    while len(result) < count:
+        action = int(rng.choice(np.flatnonzero(info["action_mask"])))
+        next_state, reward, done, _, info = env.step(action)
+        result.append((state, action, reward, next_state, done))
+        state = next_state
+        step += 1
+        if done or (episode % cut_every == cut_every - 1 and step == 4):
+            state, info = env.reset()
+            episode += 1
+            step = 0
+    return result
+
+
+def expected_slots(added, capacity):
+    """The transitions a ring of `capacity` should hold, by slot."""
+    slots = [None] * capacity
+    for k, transition in enumerate(added):
+        slots[k % capacity] = transition
+    return slots[:len(added)]
+
+
+@pytest.mark.parametrize("capacity, count", [(50, 30), (50, 50), (50, 173), (1, 5)])
+def test_ring_matches_reference(capacity, count):
+    added = transitions(count)
+    buffer = ReplayBuffer(capacity, (5, 5), seed=0)
+    for transition in added:
+        buffer.add(*transition)
+    assert len(buffer) == min(count, capacity)
+    assert buffer.position == count % capacity
+
+    slots = expected_slots(added, capacity)
+    states, actions, rewards, next_states, dones = buffer._gather(np.arange(len(buffer)))
+    for i, (state, action, reward, next_state, done) in enumerate(slots):
+        np.testing.assert_array_equal(states[i], state)
+        assert actions[i] == action
+        assert rewards[i] == pytest.approx(reward)
+        assert dones[i] == done
+        # Terminal transitions do not bootstrap, so their next state is zeroed
+        np.testing.assert_array_equal(next_states[i], 0.0 if done else next_state)
+
+
+def test_next_states_read_by_index():
+    added = transitions(200, cut_every=1000)
+    buffer = ReplayBuffer(64, (5, 5))
+    for transition in added:
+        buffer.add(*transition)
+    # Within unbroken episodes only the newest transition keeps its next state aside
+    assert set(buffer.next_states) <= {(buffer.position - 1) % buffer.capacity}
+
+
+def test_cut_off_episodes_keep_their_next_state():
+    buffer = ReplayBuffer(10, (2, 2))
+    first, second, other = (np.full((2, 2), v, dtype=np.int8) for v in (1, -1, 0))
+    buffer.add(first, 0, -0.1, second, False)
+    # A new episode starts without the previous one reaching `second`
+    buffer.add(other, 1, -0.1, first, False)
+    _, _, _, next_states, _ = buffer._gather(np.array([0, 1]))
+    np.testing.assert_array_equal(next_states[0], second)
+    np.testing.assert_array_equal(next_states[1], first)
+
+
+def test_sample_types_and_memory():
+    buffer = ReplayBuffer(100, (5, 5), seed=1)
+    for transition in transitions(120):
+        buffer.add(*transition)
+    states, actions, rewards, next_states, dones = buffer.sample(32)
+    assert states.shape == next_states.shape == (32, 5, 5)
+    assert (states.dtype, actions.dtype, rewards.dtype, next_states.dtype, dones.dtype) == (
+        np.float32, np.int64, np.float32, np.float32, np.float32)
+    assert buffer.states.dtype == np.int8
+    # int8 board, int64 action, float32 reward and bool done per slot, plus side-stored boards
+    assert buffer.nbytes() == 100 * (25 + 8 + 4 + 1) + 25 * len(buffer.next_states)
+
+
+@pytest.mark.parametrize("capacity", [1, 7, 100, 1024])
+def test_sum_tree_prefix_sums(capacity):
+    rng = np.random.default_rng(capacity)
+    tree = SumTree(capacity)
+    priorities = rng.random(capacity)
+    tree.update(np.arange(capacity), priorities)
+    assert tree.total == pytest.approx(priorities.sum())
+    # Every node holds the sum of its two children
+    internal = np.arange(1, tree.leaves)
+    np.testing.assert_allclose(tree.nodes[internal], tree.nodes[2 * internal] + tree.nodes[2 * internal + 1])
+
+    values = rng.random(500) * tree.total
+    expected = np.searchsorted(np.cumsum(priorities), values, side="right")
+    np.testing.assert_array_equal(tree.find(values), expected)
+
+
+def test_sum_tree_updates():
+    tree = SumTree(10)
+    tree.update(np.arange(10), np.ones(10))
+    tree.update([3, 3, 8], [5.0, 2.0, 0.0])
+    # With repeated indices the last priority wins
+    np.testing.assert_array_equal(tree[[3, 8]], [2.0, 0.0])
+    assert tree.total == pytest.approx(10.0)
+    # Leaves with no priority are never found
+    found = tree.find(np.linspace(0, tree.total, 1000, endpoint=False))
+    assert 8 not in found
+    assert np.bincount(found, minlength=10)[3] == 200
+
+
+def test_prioritized_sampling_follows_priorities():
+    buffer = PrioritizedReplayBuffer(8, (5, 5), alpha=1.0, epsilon=0.0, seed=0)
+    for transition in transitions(8):
+        buffer.add(*transition)
+    # New transitions start at the largest priority seen so far
+    np.testing.assert_array_equal(buffer.tree[np.arange(8)], 1.0)
+
+    buffer.update_priorities(np.arange(8), np.array([1, 2, 3, 4, 0, 0, 0, 6], dtype=np.float64))
+    assert buffer.max_priority == 6.0
+    counts = np.zeros(8)
+    for _ in range(500):
+        *_, weights, indices = buffer.sample(16)
+        counts += np.bincount(indices, minlength=8)
+        assert weights.dtype == np.float32
+        assert weights.max() == pytest.approx(1.0)
+    assert counts[4:7].sum() == 0
+    np.testing.assert_allclose(counts / counts.sum(), np.array([1, 2, 3, 4, 0, 0, 0, 6]) / 16, atol=0.01)
+
+
+def test_importance_weights_and_beta():
+    buffer = PrioritizedReplayBuffer(4, (5, 5), alpha=1.0, beta=0.5, beta_steps=10, epsilon=0.0, seed=0)
+    for transition in transitions(4):
+        buffer.add(*transition)
+    buffer.update_priorities(np.arange(4), np.array([1.0, 1.0, 1.0, 4.0]))
+    *_, weights, indices = buffer.sample(7)
+    # w_i = (N * P(i)) ** -beta, normalised by the largest
+    expected = (4 * np.array([1, 1, 1, 4])[indices] / 7) ** -0.5
+    np.testing.assert_allclose(weights, expected / expected.max(), rtol=1e-6)
+    for _ in range(20):
+        buffer.sample(4)
+    assert buffer.beta == 1.0
+
+
+def test_prioritized_ring_holds_the_newest_transitions():
+    added = transitions(30)
+    buffer = PrioritizedReplayBuffer(8, (5, 5), seed=0)
+    for transition in added:
+        buffer.add(*transition)
+    states, actions, _, _, _, _, indices = buffer.sample(64)
+    assert indices.max() < 8
+    slots = expected_slots(added, 8)
+    for state, action, index in zip(states, actions, indices):
+        np.testing.assert_array_equal(state, slots[index][0])
+        assert action == slots[index][1]
@@ -0,0 +1,55 @@
+"""ThreatSpaceSearch limits, and their accounting in GomokuAI."""
+
+import json
+import os
+import time
+
+from ai import THREAT_SPACE_SHARE, GomokuAI
+from board import Board
+from budget import SearchBudget
+from threat_space import ThreatSpaceSearch
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bench", "corpus.json")
+
+
+def open_three_position():
+    """Black to move with an open three on row 7, so one move makes an open four."""
+    board = Board(15)
+    for move in [(7, 6), (0, 0), (7, 7), (0, 2), (7, 8), (0, 4)]:
+        board.make_move(*move)
+    return board
+
+
+def test_vcf_finds_open_four():
+    line = ThreatSpaceSearch().solve(open_three_position(), "vcf")
+    assert line in ([(7, 5)], [(7, 9)])
+
+
+def test_solve_stops_at_deadline():
+    search = ThreatSpaceSearch()
+    assert search.solve(open_three_position(), "vct", deadline=time.time() - 1) is None
+    assert search.exhausted
+    assert search.nodes == 1
+
+
+def test_threat_space_nodes_recorded():
+    ai = GomokuAI(difficulty="hard", book_path=None, budget=SearchBudget(nodes=200))
+    assert ai.get_best_move(open_three_position()) in ((7, 5), (7, 9))
+    assert ai.stats.source == "threat_space"
+    assert ai.stats.threat_space_nodes == ai.threat_space_nodes > 0
+    assert ai.stats.to_dict()["threat_space_nodes"] == ai.threat_space_nodes
+
+
+def test_threat_space_keeps_to_its_share_of_the_time_budget():
+    # A corpus position where VCT runs out its node budget without a win
+    with open(CORPUS_PATH) as f:
+        position = next(p for p in json.load(f) if p["id"] == "15-midgame-6")
+    board = Board(position["size"])
+    for move in position["moves"]:
+        board.make_move(*move)
+    ai = GomokuAI(difficulty="hard", book_path=None, budget=SearchBudget(seconds=0.4))
+    ai.threat_search.node_budget = 10 ** 9
+    ai.get_best_move(board)
+    assert ai.stats.source == "search"
+    # THREAT_SPACE_SHARE of 0.4 s, plus the node in progress at the deadline
+    assert ai.stats.phases["threat_space"] < 0.4 * THREAT_SPACE_SHARE + 0.1
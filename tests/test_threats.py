@@ -0,0 +1,130 @@
+"""find_threat_move must pick the same move as the per-cell threat scan it replaced."""
+
+import random
+
+import pytest
+
+from ai import FORCING_THREATS, WINNING_THREATS
+from board import Board
+from threats import THREAT_PRIORITY, find_threat_move
+
+DIRECTIONS = [(1, 0), (0, 1), (1, 1), (1, -1)]
+
+
+def legacy_check_for_threats(board, player_color, threat_types=THREAT_PRIORITY):
+    """The original GomokuAI._check_for_threats, testing each empty cell in turn."""
+    size = board.size
+    opponent_color = -player_color
+    threat_moves = {threat_type: [] for threat_type in THREAT_PRIORITY}
+    checks = [
+        ("win", player_color, _has_five_in_a_row),
+        ("block_win", opponent_color, _has_five_in_a_row),
+        ("create_open4", player_color, _has_open_four),
+        ("block_open4", opponent_color, _has_open_four),
+        ("create_open3", player_color, _has_open_three),
+        ("block_open3", opponent_color, _has_open_three),
+        ("extend_seq", player_color, _extends_sequence),
+    ]
+
+    for i in range(size):
+        for j in range(size):
+            if board.board[i][j] != 0:
+                continue
+            # Each cell is filed under the first class it matches
+            for threat_type, color, check in checks:
+                if _test_move(board, i, j, color, check):
+                    threat_moves[threat_type].append((i, j))
+                    break
+
+    for threat_type in threat_types:
+        if threat_moves[threat_type]:
+            # Closest to the center; the sort is stable, so ties keep row-major order
+            center = size // 2
+            threat_moves[threat_type].sort(key=lambda m: abs(m[0] - center) + abs(m[1] - center))
+            return threat_moves[threat_type][0]
+    return None
+
+
+def _test_move(board, row, col, color, check):
+    board.board[row][col] = color
+    try:
+        return check(board, row, col, color)
+    finally:
+        board.board[row][col] = 0
+
+
+def _run(board, row, col, dr, dc, color):
+    """Length of the run of `color` from (row, col) along (dr, dc), and the cell after it."""
+    size = board.size
+    count = 0
+    r, c = row + dr, col + dc
+    while 0 <= r < size and 0 <= c < size and board.board[r][c] == color:
+        count += 1
+        r += dr
+        c += dc
+    return count, r, c
+
+
+def _is_empty(board, r, c):
+    return 0 <= r < board.size and 0 <= c < board.size and board.board[r][c] == 0
+
+
+def _has_five_in_a_row(board, row, col, color):
+    for dr, dc in DIRECTIONS:
+        forward, _, _ = _run(board, row, col, dr, dc, color)
+        backward, _, _ = _run(board, row, col, -dr, -dc, color)
+        if 1 + forward + backward >= 5:
+            return True
+    return False
+
+
+def _has_open_four(board, row, col, color):
+    for dr, dc in DIRECTIONS:
+        forward, r1, c1 = _run(board, row, col, dr, dc, color)
+        backward, r2, c2 = _run(board, row, col, -dr, -dc, color)
+        empty_ends = _is_empty(board, r1, c1) + _is_empty(board, r2, c2)
+        if 1 + forward + backward == 4 and empty_ends >= 1:
+            return True
+    return False
+
+
+def _has_open_three(board, row, col, color):
+    for dr, dc in DIRECTIONS:
+        forward, r1, c1 = _run(board, row, col, dr, dc, color)
+        backward, r2, c2 = _run(board, row, col, -dr, -dc, color)
+        if 1 + forward + backward == 3 and _is_empty(board, r1, c1) and _is_empty(board, r2, c2):
+            return True
+    return False
+
+
+def _extends_sequence(board, row, col, color):
+    for dr, dc in DIRECTIONS:
+        forward, _, _ = _run(board, row, col, dr, dc, color)
+        backward, _, _ = _run(board, row, col, -dr, -dc, color)
+        if 1 + forward + backward >= 2:
+            return True
+    return False
+
+
+def clustered_position(size, stones, rng):
+    """Play up to `stones` random moves near the centre, so lines and threats form."""
+    board = Board(size)
+    center = size // 2
+    reach = min(4, center)
+    for _ in range(stones * 3):
+        if len(board.move_history) >= stones:
+            break
+        board.make_move(center + rng.randint(-reach, reach), center + rng.randint(-reach, reach))
+    return board
+
+
+@pytest.mark.parametrize("threat_types", [THREAT_PRIORITY, WINNING_THREATS, FORCING_THREATS],
+                         ids=["all", "winning", "forcing"])
+@pytest.mark.parametrize("size", [9, 15, 19])
+def test_find_threat_move_matches_legacy_scan(size, threat_types):
+    rng = random.Random(size)
+    for _ in range(60):
+        board = clustered_position(size, rng.randint(0, 40), rng)
+        player = board.current_player
+        expected = legacy_check_for_threats(board, player, threat_types)
+        assert find_threat_move(board, player, threat_types) == expected, str(board)
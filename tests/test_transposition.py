@@ -0,0 +1,159 @@
+"""Transposition table entry packing, bucket replacement and the shared table file."""
+
+import os
+import random
+from multiprocessing import Pool
+
+import pytest
+
+from transposition import (EXACT, LOWER, SLOTS, UPPER, SharedTranspositionTable, TranspositionTable,
+                           compact_table, inspect_table, pack, unpack)
+
+
+@pytest.fixture(params=["memory", "file"])
+def table(request, tmp_path):
+    if request.param == "memory":
+        yield TranspositionTable(size_mb=0.01)
+    else:
+        shared = SharedTranspositionTable(os.path.join(tmp_path, "tt.bin"), size_mb=0.01)
+        yield shared
+        shared.close()
+
+
+def same_bucket(table, count):
+    """`count` distinct keys that all map to bucket 3."""
+    buckets = table.mask + 1
+    return [3 + buckets * (i + 1) + (i << 60) for i in range(count)]
+
+
+@pytest.mark.parametrize("entry", [
+    (0, EXACT, 0, -1),
+    (255, UPPER, -(2 ** 31), 0),
+    (6, LOWER, 2 ** 31 - 1, 360),
+    (12, EXACT, -100000, 65534),
+])
+def test_pack_round_trip(entry):
+    data = pack(*entry)
+    assert data != 0
+    assert data < 2 ** 64
+    assert unpack(data) == entry
+
+
+def test_probe_and_store(table):
+    key = 0x1234_5678_9ABC_DEF0
+    assert table.probe(key) is None
+    table.store(key, 4, LOWER, -250, 17)
+    assert table.probe(key) == (4, LOWER, -250, 17)
+    assert (table.hits, table.misses, table.stores) == (1, 1, 1)
+    # Storing the same position again replaces it in place
+    table.store(key, 2, EXACT, 30)
+    assert table.probe(key) == (2, EXACT, 30, -1)
+    assert table.overwrites == 0
+
+
+def test_bucket_keeps_deepest_and_latest(table):
+    deep, shallow, newer, deeper = same_bucket(table, 4)
+    table.store(deep, 8, EXACT, 1)
+    table.store(shallow, 3, EXACT, 2)
+    assert table.probe(deep) == (8, EXACT, 1, -1)
+    assert table.probe(shallow) == (3, EXACT, 2, -1)
+
+    # A shallower search cannot evict the deep entry, only the always-replace slot
+    table.store(newer, 5, EXACT, 3)
+    assert table.probe(deep) is not None
+    assert table.probe(shallow) is None
+    assert table.probe(newer) == (5, EXACT, 3, -1)
+
+    # A deeper one takes the depth-preferred slot
+    table.store(deeper, 9, UPPER, 4)
+    assert table.probe(deep) is None
+    assert table.probe(newer) is not None
+    assert table.probe(deeper) == (9, UPPER, 4, -1)
+    assert table.overwrites == 2
+
+
+def test_clear(table):
+    key = 99
+    table.store(key, 1, EXACT, 5)
+    table.clear()
+    assert table.probe(key) is None
+    assert table.stores == 0
+
+
+def test_shared_table_persists(tmp_path):
+    path = os.path.join(tmp_path, "tt.bin")
+    table = SharedTranspositionTable(path, size_mb=0.01)
+    keys = [key * 0x9E3779B97F4A7C15 % 2 ** 64 for key in range(1, 200)]
+    for i, key in enumerate(keys):
+        table.store(key, i % 10, EXACT, key % 10007, key % 225)
+    table.close()
+
+    # Reopening keeps the file's own size, whatever size_mb asks for
+    table = SharedTranspositionTable(path, size_mb=4)
+    assert len(table) == (table.mask + 1) * SLOTS
+    for key in keys:
+        entry = table.probe(key)
+        assert entry is None or entry[2:] == (key % 10007, key % 225)
+    table.close()
+
+
+def test_shared_table_rejects_other_files(tmp_path):
+    path = os.path.join(tmp_path, "not_a_table.bin")
+    with open(path, "wb") as f:
+        f.write(b"x" * 64)
+    with pytest.raises(ValueError):
+        SharedTranspositionTable(path)
+
+
+def test_torn_slot_reads_as_miss(tmp_path):
+    table = SharedTranspositionTable(os.path.join(tmp_path, "tt.bin"), size_mb=0.01)
+    key = 5
+    table.store(key, 3, EXACT, 7)
+    slot = (key & table.mask) * SLOTS
+    # A second writer's data word landing without its key word
+    table.words[table.base + 2 * slot + 1] = pack(4, LOWER, 8, -1)
+    assert table.probe(key) is None
+    assert list(table.entries()) == []
+    table.close()
+
+
+def hammer(args):
+    """Store and probe random keys whose entry is derived from the key; count wrong entries."""
+    path, seed, operations = args
+    table = SharedTranspositionTable(path)
+    rng = random.Random(seed)
+    wrong = 0
+    for _ in range(operations):
+        # Few enough keys that processes keep colliding on the same slots
+        key = rng.randrange(1, 4096) * 0x9E3779B97F4A7C15 % 2 ** 64
+        if rng.random() < 0.5:
+            table.store(key, rng.randrange(10), EXACT, key % 10007, key % 225)
+        else:
+            entry = table.probe(key)
+            wrong += entry is not None and entry[2:] != (key % 10007, key % 225)
+    table.close()
+    return wrong
+
+
+def test_concurrent_writers_never_return_wrong_entries(tmp_path):
+    path = os.path.join(tmp_path, "tt.bin")
+    SharedTranspositionTable(path, size_mb=0.01).close()
+    with Pool(3) as pool:
+        assert sum(pool.map(hammer, [(path, seed, 20000) for seed in range(3)])) == 0
+
+
+def test_compact_keeps_deepest_entries(tmp_path):
+    path = os.path.join(tmp_path, "tt.bin")
+    table = SharedTranspositionTable(path, size_mb=0.01)
+    assert table.mask + 1 > 64
+    # Separate buckets here, all bucket 3 of a 32-bucket table
+    for key, depth in ((3, 2), (3 + 32, 5), (3 + 64, 3), (4, 1)):
+        table.store(key, depth, EXACT, depth)
+    table.close()
+
+    output = os.path.join(tmp_path, "small.bin")
+    assert compact_table(path, 0.001, output) == 3
+    summary = inspect_table(output)
+    assert summary["entries"] == 32 * SLOTS
+    assert summary["torn"] == 0
+    assert summary["depths"] == {1: 1, 3: 1, 5: 1}
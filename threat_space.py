@@ -0,0 +1,223 @@
+"""
+Gomoku Threat-Space Search Module
+
+Proves wins by continuous threats before the main search runs. VCF
+(victory by continuous fours) only plays moves that threaten five, so the
+defender's reply is forced. VCT (victory by continuous threats) also plays
+open threes and must then beat every reasonable defence: a block on the
+three's line or a counter-four. Both searches have a node budget and an
+optional deadline, can be cancelled through a budget.CancelToken and share
+a bounded cache of proven and refuted positions.
+"""
+
+import time
+
+import numpy as np
+
+from evaluator import BLOCKED, OPEN_THREE, PATTERN_TABLE, POWERS, VIEW, get_evaluator
+
+_five_windows = {}
+
+
+def five_windows(size):
+    """Return a (windows, 5) array of flat indices for every five-cell stretch."""
+    if size not in _five_windows:
+        windows = []
+        for r in range(size):
+            for c in range(size):
+                for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_r, end_c = r + 4 * dr, c + 4 * dc
+                    if 0 <= end_r < size and 0 <= end_c < size:
+                        windows.append([(r + k * dr) * size + c + k * dc for k in range(5)])
+        _five_windows[size] = np.array(windows, dtype=np.intp)
+    return _five_windows[size]
+
+
+class ThreatSpaceSearch:
+    def __init__(self, node_budget=20000, cache_size=200000, vcf_depth=12, vct_depth=3):
+        self.node_budget = node_budget
+        self.cache_size = cache_size
+        self.vcf_depth = vcf_depth
+        self.vct_depth = vct_depth
+        self.cache = {}
+        self.nodes = 0
+        self.cache_hits = 0
+        self.exhausted = False
+        self.cancel = None
+        self.deadline = None
+
+    # Pattern helpers
+
+    def _points(self, board, player, stones):
+        """Empty cells in five-cell stretches holding `stones` of `player` and no opponent stone."""
+        windows = five_windows(board.size)
+        cells = board.board.ravel()[windows]
+        mask = ((cells == player).sum(axis=1) == stones) & ~(cells == -player).any(axis=1)
+        hits = windows[mask][cells[mask] == 0]
+        if not len(hits):
+            return []
+        # Most frequent first (cells on several lines make stronger threats),
+        # then closest to the centre
+        points, counts = np.unique(hits, return_counts=True)
+        center = board.size // 2
+        rows, cols = np.divmod(points, board.size)
+        order = np.lexsort((np.abs(rows - center) + np.abs(cols - center), -counts))
+        return [(int(rows[i]), int(cols[i])) for i in order]
+
+    def five_points(self, board, player):
+        """Cells where `player` would complete five."""
+        return self._points(board, player, 4)
+
+    def four_points(self, board, player):
+        """Cells where `player` would make a four (a threat to complete five)."""
+        return self._points(board, player, 3)
+
+    def three_points(self, board, player):
+        """Cells that might give `player` a three; open_three() confirms it."""
+        return self._points(board, player, 2)
+
+    def open_three(self, board, row, col, player):
+        """True if the `player` stone at (row, col) is part of an open three."""
+        patterns = get_evaluator(board.size)
+        index = row * board.size + col
+        windows = patterns.cell_windows[index]
+        windows = patterns.windows[windows[windows < len(patterns.windows)]]
+        cells = np.append(VIEW[player][board.board.ravel() + 1], BLOCKED)
+        return bool((PATTERN_TABLE[cells[windows] @ POWERS] == OPEN_THREE).any())
+
+    # Searches
+
+    def solve(self, board, mode="vcf", cancel=None, deadline=None):
+        """Return a winning sequence for the side to move, or None.
+
+        The sequence alternates attacker and defender moves, starts with the
+        move to play now and ends with a move that makes five or threatens
+        two fives at once. For VCT it follows the first defence tried at each
+        step. None means no win was proven within the node budget, before
+        the CancelToken `cancel` was set or before time.time() passed
+        `deadline`.
+        """
+        board = board.copy()
+        attacker = board.current_player
+        self.nodes = 0
+        self.exhausted = False
+        self.cancel = cancel
+        self.deadline = deadline
+        if len(self.cache) > self.cache_size:
+            self.cache.clear()
+        if mode == "vct":
+            return self._vct(board, attacker, self.vct_depth)
+        return self._vcf(board, attacker, self.vcf_depth)
+
+    def _visit(self):
+        self.nodes += 1
+        if (self.nodes > self.node_budget or (self.cancel is not None and self.cancel.cancelled)
+                or (self.deadline is not None and time.time() > self.deadline)):
+            self.exhausted = True
+        return not self.exhausted
+
+    def _cached(self, board, mode, depth, search):
+        # Keyed by the canonical position so symmetric positions share
+        # entries; lines are stored in the canonical frame
+        key = (board.canonical_key, mode, depth)
+        transform = board.canonical_transform
+        if key in self.cache:
+            self.cache_hits += 1
+            line = self.cache[key]
+            return None if line is None else [board.from_canonical(move, transform) for move in line]
+        result = search()
+        # Out-of-budget failures prove nothing, so they are not cached
+        if result is not None:
+            self.cache[key] = [board.to_canonical(move, transform) for move in result]
+        elif not self.exhausted:
+            self.cache[key] = None
+        return result
+
+    def _vcf(self, board, attacker, depth):
+        return self._cached(board, "vcf", depth, lambda: self._search_vcf(board, attacker, depth))
+
+    def _search_vcf(self, board, attacker, depth):
+        if not self._visit():
+            return None
+
+        wins = self.five_points(board, attacker)
+        if wins:
+            return [wins[0]]
+        if depth == 0:
+            return None
+
+        # A four only helps if it also blocks any five the defender threatens
+        threats = self.five_points(board, -attacker)
+        if len(threats) > 1:
+            return None
+        candidates = self.four_points(board, attacker)
+        if threats:
+            candidates = [move for move in candidates if move in threats]
+
+        for move in candidates:
+            board.make_move(*move)
+            fives = self.five_points(board, attacker)
+            line = None
+            if len(fives) >= 2:
+                # Open four or double four: the defender cannot block both
+                line = [move]
+            elif fives:
+                block = fives[0]
+                board.make_move(*block)
+                if not board.check_win():
+                    rest = self._vcf(board, attacker, depth - 1)
+                    if rest is not None:
+                        line = [move, block] + rest
+                board.undo_move()
+            board.undo_move()
+            if line is not None:
+                return line
+            if self.exhausted:
+                break
+        return None
+
+    def _vct(self, board, attacker, depth):
+        return self._cached(board, "vct", depth, lambda: self._search_vct(board, attacker, depth))
+
+    def _search_vct(self, board, attacker, depth):
+        if not self._visit():
+            return None
+
+        # Continuous fours are cheaper to prove and cover any forced block
+        line = self._vcf(board, attacker, self.vcf_depth)
+        if line is not None or depth == 0 or self.exhausted:
+            return line
+        if self.five_points(board, -attacker):
+            return None
+
+        fours = set(self.four_points(board, attacker))
+        for move in self.three_points(board, attacker):
+            if move in fours:
+                continue  # Already tried as part of the VCF
+            board.make_move(*move)
+            if self.open_three(board, move[0], move[1], attacker):
+                line = self._refute_all(board, attacker, depth)
+            board.undo_move()
+            if line is not None:
+                return [move] + line
+            if self.exhausted:
+                break
+        return None
+
+    def _refute_all(self, board, attacker, depth):
+        """Defender to move after a three: return a winning line if every defence fails."""
+        defender = -attacker
+        if self.five_points(board, defender):
+            return None
+        defences = set(self.four_points(board, attacker)) | set(self.four_points(board, defender))
+
+        main_line = None
+        for defence in sorted(defences):
+            board.make_move(*defence)
+            rest = None if board.check_win() else self._vct(board, attacker, depth - 1)
+            board.undo_move()
+            if rest is None:
+                return None
+            if main_line is None:
+                main_line = [defence] + rest
+        return main_line
@@ -0,0 +1,106 @@
+"""
+Gomoku Threat Detection Module
+
+Finds, for every empty cell at once, whether a stone of either colour there
+would make five, a four or an open three. Runs are measured with shifted
+views of a padded copy of the board, so a full scan is a few hundred NumPy
+operations on size x size arrays regardless of the game stage.
+"""
+
+import numpy as np
+
+# Threat classes, highest priority first
+THREAT_PRIORITY = ("win", "block_win", "create_open4", "block_open4", "create_open3", "block_open3", "extend_seq")
+
+DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+PAD = 6  # Longest look-ahead: a run of five stones plus the cell after it
+OFF_BOARD = 2
+
+
+def _shift(padded, size, dr, dc, k):
+    """View of `padded` where each cell holds the value k steps along (dr, dc)."""
+    r, c = PAD + dr * k, PAD + dc * k
+    return padded[r:r + size, c:c + size]
+
+
+def line_shapes(board, color):
+    """Return (count, open_ends) arrays of shape (4, size, size).
+
+    count[d] is the length of the run of `color` a stone on each cell would
+    join along direction d (the stone included); open_ends[d] is how many of
+    the two cells just beyond that run are empty.
+    """
+    size = board.size
+    padded = np.full((size + 2 * PAD, size + 2 * PAD), OFF_BOARD, dtype=np.int8)
+    padded[PAD:PAD + size, PAD:PAD + size] = board.board
+    stones = padded == color
+    empty = padded == 0
+
+    count = np.ones((4, size, size), dtype=np.int8)
+    open_ends = np.zeros((4, size, size), dtype=np.int8)
+    for d, (dr, dc) in enumerate(DIRECTIONS):
+        for sign in (1, -1):
+            run = np.zeros((size, size), dtype=np.int8)
+            alive = np.ones((size, size), dtype=bool)
+            end_empty = np.zeros((size, size), dtype=bool)
+            for k in range(1, PAD):
+                # Cells whose run in this direction stopped just before step k
+                end_empty |= alive & ~_shift(stones, size, sign * dr, sign * dc, k) & _shift(empty, size, sign * dr, sign * dc, k)
+                alive &= _shift(stones, size, sign * dr, sign * dc, k)
+                run += alive
+            count[d] += run
+            open_ends[d] += end_empty
+    return count, open_ends
+
+
+def threat_maps(board, player):
+    """Return a boolean map of empty cells for every threat class.
+
+    Classes are from `player`'s point of view and mirror the checks the AI
+    has always used: five or more in a row, a run of four with at least
+    one open end, a run of three open at both ends, and a run of two or more.
+    """
+    empty = board.board == 0
+    ours, our_ends = line_shapes(board, player)
+    theirs, their_ends = line_shapes(board, -player)
+
+    def five(count):
+        return (count >= 5).any(axis=0)
+
+    def four(count, ends):
+        return ((count == 4) & (ends >= 1)).any(axis=0)
+
+    def three(count, ends):
+        return ((count == 3) & (ends == 2)).any(axis=0)
+
+    return {
+        "win": empty & five(ours),
+        "block_win": empty & five(theirs),
+        "create_open4": empty & four(ours, our_ends),
+        "block_open4": empty & four(theirs, their_ends),
+        "create_open3": empty & three(ours, our_ends),
+        "block_open3": empty & three(theirs, their_ends),
+        "extend_seq": empty & (ours >= 2).any(axis=0),
+    }
+
+
+def find_threat_move(board, player, threat_types=THREAT_PRIORITY):
+    """Return the move for the highest-priority threat class present, or None.
+
+    Each cell belongs only to the first class in THREAT_PRIORITY it matches;
+    classes are then tried in that order, restricted to `threat_types`.
+    Within a class the cell closest to the centre wins, ties going to the
+    first in row-major order.
+    """
+    maps = threat_maps(board, player)
+    center = board.size // 2
+    rows, cols = np.indices(board.board.shape)
+    distance = np.abs(rows - center) + np.abs(cols - center)
+    claimed = np.zeros(board.board.shape, dtype=bool)
+    for threat_type in THREAT_PRIORITY:
+        cells = maps[threat_type] & ~claimed
+        claimed |= maps[threat_type]
+        if threat_type in threat_types and cells.any():
+            index = int(np.argmin(np.where(cells, distance, np.iinfo(distance.dtype).max)))
+            return divmod(index, board.size)
+    return None
@@ -1,14 +1,31 @@
 import numpy as np
 from gomoku_env import GomokuEnv
 from dqn_agent import DQNAgent
+from actor_learner import train_actor_learner
 from torch.utils.tensorboard import SummaryWriter
 import os
 
-def train(episodes=20000, batch_size=64, target_update=20):
+def train(episodes=20000, batch_size=64, target_update=20, prioritized=False, actors=0):
+    """Train a DQN agent by self-play.
+
+    With `actors` > 0, games are played by that many actor processes while
+    this process only learns (see actor_learner). The target network is then
+    updated on the learner's own schedule, counted in updates rather than
+    every `target_update` episodes.
+    """
+    if actors:
+        if not os.path.exists('logs'):
+            os.makedirs('logs')
+        writer = SummaryWriter('logs/gomoku_dqn')
+        agent, stats = train_actor_learner(actors, episodes, batch_size, prioritized=prioritized, writer=writer)
+        print(f"{stats['episodes']} episodes in {stats['seconds']:.0f} s: "
+              f"{stats['episodes_per_hour']:.0f} episodes/hour, {stats['updates_per_second']:.1f} updates/s")
+        return agent
+
     env = GomokuEnv()
     state_size = env.size
     action_size = env.size * env.size
-    agent = DQNAgent(state_size, action_size)
+    agent = DQNAgent(state_size, action_size, prioritized=prioritized)
     
     # Create logs directory for tensorboard
     if not os.path.exists('logs'):
@@ -16,14 +33,13 @@ def train(episodes=20000, batch_size=64, target_update=20):
     writer = SummaryWriter('logs/gomoku_dqn')
     
     for episode in range(episodes):
-        state, _ = env.reset()
+        state, info = env.reset()
         total_reward = 0
         done = False
         
         while not done:
-            valid_moves = [i * env.size + j for i, j in env.board.get_valid_moves()]
-            action = agent.act(state, valid_moves)
-            next_state, reward, done, _, _ = env.step(action)
+            action = agent.act(state, info["action_mask"])
+            next_state, reward, done, _, info = env.step(action)
             agent.remember(state, action, reward, next_state, done)
             state = next_state
             total_reward += reward
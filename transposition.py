@@ -0,0 +1,309 @@
+"""
+Gomoku Transposition Table Module
+
+Fixed-size transposition table keyed by the board's Zobrist hash. Entries
+live in two flat arrays of 64-bit words (keys and packed data), grouped in
+buckets of two slots: the first slot keeps the deepest search seen for the
+bucket and the second is always replaced.
+
+SharedTranspositionTable keeps the same layout in a memory-mapped file, so
+several processes can use one table at once and it survives restarts. Run
+this module to create, inspect or compact a table file.
+"""
+
+import argparse
+import mmap
+import os
+import struct
+from array import array
+
+# Bound types
+EXACT = 0
+LOWER = 1  # Score is a lower bound (search failed high)
+UPPER = 2  # Score is an upper bound (search failed low)
+
+ENTRY_BYTES = 16  # One 64-bit key word and one 64-bit data word
+SLOTS = 2
+SCORE_OFFSET = 1 << 31
+
+# Table file layout: this header, then one (key ^ data, data) pair of 64-bit
+# words per slot
+FILE_MAGIC = b"GMTT"
+FILE_VERSION = 1
+FILE_HEADER = struct.Struct("<4sH2xQ")  # magic, version, bucket count
+HEADER_WORDS = FILE_HEADER.size // 8
+
+
+def pack(depth, flag, score, move):
+    """Pack an entry into one 64-bit word.
+
+    Layout: score + 2**31 in bits 0-31, depth in 32-39, bound type in 40-41
+    and move index + 1 (0 for no move) in 42-57. The offset keeps every
+    stored word non-zero, so zero marks an empty slot.
+    """
+    return ((score + SCORE_OFFSET)
+            | depth << 32
+            | flag << 40
+            | (move + 1) << 42)
+
+
+def unpack(data):
+    """Return (depth, flag, score, move) from a packed word; move is -1 if none."""
+    return ((data >> 32) & 0xFF,
+            (data >> 40) & 0x3,
+            (data & 0xFFFFFFFF) - SCORE_OFFSET,
+            ((data >> 42) & 0xFFFF) - 1)
+
+
+def bucket_count(size_mb):
+    """Number of buckets a table of `size_mb` megabytes holds (a power of two)."""
+    entries = max(SLOTS, int(size_mb * 2 ** 20) // ENTRY_BYTES)
+    return 1 << ((entries // SLOTS).bit_length() - 1)
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=16):
+        # The bucket count is a power of two so indexing is a mask
+        buckets = bucket_count(size_mb)
+        self.size_mb = size_mb
+        self.mask = buckets - 1
+        self.keys = array('Q', bytes(8 * buckets * SLOTS))
+        self.data = array('Q', bytes(8 * buckets * SLOTS))
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0  # Stores that evicted a different position
+
+    def __len__(self):
+        return len(self.keys)
+
+    def probe(self, key):
+        """Return (depth, flag, score, move) for `key`, or None on a miss."""
+        slot = (key & self.mask) * SLOTS
+        for i in (slot, slot + 1):
+            if self.keys[i] == key and self.data[i]:
+                self.hits += 1
+                return unpack(self.data[i])
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, flag, score, move=-1):
+        """Store a search result, using the depth-preferred/always-replace policy."""
+        slot = (key & self.mask) * SLOTS
+        data = pack(depth, flag, int(score), move)
+
+        # The depth-preferred slot takes the entry if it is empty, holds the
+        # same position, or holds a shallower search; otherwise the
+        # always-replace slot does
+        old = self.data[slot]
+        if old and self.keys[slot] != key and (old >> 32) & 0xFF > depth:
+            slot += 1
+            old = self.data[slot]
+
+        if old and self.keys[slot] != key:
+            self.overwrites += 1
+        self.keys[slot] = key
+        self.data[slot] = data
+        self.stores += 1
+
+    def clear(self):
+        """Empty the table and reset its counters."""
+        empty = bytes(8 * len(self.keys))
+        self.keys = array('Q', empty)
+        self.data = array('Q', empty)
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "size_mb": self.size_mb,
+            "entries": len(self.keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+            "overwrites": self.overwrites,
+        }
+
+
+class SharedTranspositionTable(TranspositionTable):
+    """Transposition table stored in a memory-mapped file.
+
+    Any number of processes may open the same file and probe and store
+    concurrently without locks. Each slot holds ``key ^ data`` next to
+    ``data``, and a probe only accepts a slot whose two words agree with
+    the key, so an entry torn by two simultaneous writers reads as a miss
+    instead of a wrong score. An existing file keeps its own size;
+    `size_mb` only sizes a new one.
+    """
+
+    def __init__(self, path, size_mb=16):
+        self.path = path
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            create_table_file(path, bucket_count(size_mb))
+
+        with open(path, "r+b") as f:
+            self.map = mmap.mmap(f.fileno(), 0)
+        magic, version, buckets = FILE_HEADER.unpack_from(self.map)
+        if magic != FILE_MAGIC or version != FILE_VERSION:
+            self.map.close()
+            raise ValueError(f"{path} is not a version {FILE_VERSION} transposition table")
+        self.size_mb = buckets * SLOTS * ENTRY_BYTES / 2 ** 20
+        self.mask = buckets - 1
+        # Slot i is words[base + 2i] (key ^ data) and words[base + 2i + 1] (data)
+        self.words = memoryview(self.map).cast("Q")
+        self.base = HEADER_WORDS
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.overwrites = 0
+
+    def __len__(self):
+        return (self.mask + 1) * SLOTS
+
+    def _read(self, i):
+        """Return (key, data) of slot i, or (None, 0) if it is empty or torn."""
+        words = self.words
+        w = self.base + 2 * i
+        data = words[w + 1]
+        if not data:
+            return None, 0
+        return words[w] ^ data, data
+
+    def probe(self, key):
+        slot = (key & self.mask) * SLOTS
+        for i in (slot, slot + 1):
+            stored, data = self._read(i)
+            if stored == key:
+                self.hits += 1
+                return unpack(data)
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, flag, score, move=-1):
+        slot = (key & self.mask) * SLOTS
+        data = pack(depth, flag, int(score), move)
+
+        stored, old = self._read(slot)
+        if old and stored != key and (old >> 32) & 0xFF > depth:
+            slot += 1
+            stored, old = self._read(slot)
+
+        if old and stored != key:
+            self.overwrites += 1
+        w = self.base + 2 * slot
+        self.words[w + 1] = data
+        self.words[w] = key ^ data
+        self.stores += 1
+
+    def entries(self):
+        """Yield (key, data) for every valid slot.
+
+        Slots whose decoded key does not belong in their bucket were torn by
+        concurrent writers and are skipped. Other torn slots decode to keys
+        no position will probe for, so they are harmless.
+        """
+        for i in range(len(self)):
+            key, data = self._read(i)
+            if data and key & self.mask == i // SLOTS:
+                yield key, data
+
+    def clear(self):
+        """Empty the table file and reset the counters."""
+        self.map[FILE_HEADER.size:] = bytes(len(self.map) - FILE_HEADER.size)
+        self.hits = self.misses = self.stores = self.overwrites = 0
+
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        self.words.release()
+        self.map.close()
+
+
+def create_table_file(path, buckets):
+    """Create an empty table file with `buckets` buckets."""
+    with open(path, "wb") as f:
+        f.write(FILE_HEADER.pack(FILE_MAGIC, FILE_VERSION, buckets))
+        f.truncate(FILE_HEADER.size + buckets * SLOTS * ENTRY_BYTES)
+
+
+def inspect_table(path):
+    """Return a summary of a table file: size, fill, depth/bound histograms and torn slots found."""
+    table = SharedTranspositionTable(path)
+    depths, flags, used = {}, {EXACT: 0, LOWER: 0, UPPER: 0}, 0
+    for _, data in table.entries():
+        depth, flag, _, _ = unpack(data)
+        depths[depth] = depths.get(depth, 0) + 1
+        flags[flag] = flags.get(flag, 0) + 1
+        used += 1
+    slots = len(table)
+    occupied = sum(1 for i in range(slots) if table._read(i)[1])
+    summary = {
+        "path": path,
+        "size_mb": table.size_mb,
+        "entries": slots,
+        "used": used,
+        "fill": used / slots,
+        "depths": dict(sorted(depths.items())),
+        "bounds": {"exact": flags[EXACT], "lower": flags[LOWER], "upper": flags[UPPER]},
+        "torn": occupied - used,
+    }
+    table.close()
+    return summary
+
+
+def compact_table(path, size_mb, output=None):
+    """Rewrite a table file at `size_mb`, keeping the deepest entries.
+
+    Entries are reinserted deepest first so that, when the new table is
+    smaller, the shallow searches are the ones dropped. Writes to `output`
+    (default: replaces `path`) and returns the number of entries kept.
+    """
+    source = SharedTranspositionTable(path)
+    entries = sorted(source.entries(), key=lambda entry: -((entry[1] >> 32) & 0xFF))
+    source.close()
+
+    target_path = output or path + ".tmp"
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    create_table_file(target_path, bucket_count(size_mb))
+    target = SharedTranspositionTable(target_path)
+    for key, data in entries:
+        slot = (key & target.mask) * SLOTS
+        for i in (slot, slot + 1):
+            if not target._read(i)[1]:
+                w = target.base + 2 * i
+                target.words[w + 1] = data
+                target.words[w] = key ^ data
+                break
+    kept = sum(1 for _ in target.entries())
+    target.flush()
+    target.close()
+    if output is None:
+        os.replace(target_path, path)
+    return kept
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create, inspect or compact a transposition table file.")
+    parser.add_argument("command", choices=("create", "inspect", "compact"))
+    parser.add_argument("path")
+    parser.add_argument("--size-mb", type=float, default=16, help="size of a new or compacted table")
+    parser.add_argument("--output", help="compact into this file instead of replacing the original")
+    args = parser.parse_args()
+
+    if args.command == "create":
+        if os.path.exists(args.path):
+            parser.error(f"{args.path} already exists; use compact to resize it")
+        create_table_file(args.path, bucket_count(args.size_mb))
+        print(f"Created {args.path} ({bucket_count(args.size_mb) * SLOTS} entries)")
+    elif args.command == "inspect":
+        for name, value in inspect_table(args.path).items():
+            print(f"{name:>8}: {value}")
+    else:
+        kept = compact_table(args.path, args.size_mb, args.output)
+        print(f"Kept {kept} entries in {args.output or args.path}")